@@ -75,6 +75,7 @@ def get_database_connections():
 # RSS refresh intervals (seconds)
 RSS_REFRESH_SEC = int(os.environ.get("RSS_REFRESH_SEC", "300"))  # default 5'
 DEMO_MINUTES = int(os.environ.get("DEMO_MINUTES", "10"))  # for the demo loop
+CRAWL_MAX_WORKERS = int(os.environ.get("CRAWL_MAX_WORKERS", "0"))  # 0 = one thread per country
 
 # Country-specific RSS refresh intervals
 COUNTRY_RSS_REFRESH = {
@@ -87,15 +88,29 @@ COUNTRY_RSS_REFRESH = {
 
 TRACKING_PREFIXES = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'source')
 
+# ===================== CONTENT HASHING =====================
+
+# content_hash is only used for dedup, never for signing; 'blake3' is faster but changes every digest
+CONTENT_HASH_ALGO = os.environ.get("CONTENT_HASH_ALGO", "sha256").lower()
+
+# ===================== EVENT EXTRACTION =====================
+
+# Shard event pattern extraction across independent runs: run i of N takes the i-th _id range
+EXTRACT_SHARD_INDEX = int(os.environ.get("EXTRACT_SHARD_INDEX", "0"))
+EXTRACT_SHARD_COUNT = int(os.environ.get("EXTRACT_SHARD_COUNT", "1"))  # 1 = no sharding
+# End of the 6-hour extraction window (ISO 8601, UTC if no offset); every shard of one run
+# must use the same value. Unset = now, floored to the hour when sharded
+EXTRACT_WINDOW_END = os.environ.get("EXTRACT_WINDOW_END")
+
 # ===================== EU COUNTRIES =====================
 
-EU_COUNTRIES = {
+EU_COUNTRIES = frozenset({
     'Austria', 'Belgium', 'Bulgaria', 'Croatia', 'Cyprus', 'Czech Republic',
     'Denmark', 'Estonia', 'Finland', 'France', 'Germany', 'Greece', 'Hungary',
     'Ireland', 'Italy', 'Latvia', 'Lithuania', 'Luxembourg', 'Malta',
     'Netherlands', 'Poland', 'Portugal', 'Romania', 'Slovakia', 'Slovenia',
     'Spain', 'Sweden', 'Europe'
-}
+})
 
 # ===================== HUGGING FACE CONFIGURATION =====================
 
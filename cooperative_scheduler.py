@@ -4,12 +4,13 @@ Contains CountryState and CooperativeScheduler classes for single-threaded RSS c
 """
 
 import inspect
-import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Callable, Dict, List, Set
 from time import monotonic
 
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -45,7 +46,8 @@ class CountryState:
         self.process_func = process_func
         self.corpus_args = corpus_args or []
         self.rss_url = rss_url
-        self.session = _build_retrying_session()
+        from translate import apply_country_headers
+        self.session = apply_country_headers(_build_retrying_session(), country)
         self.jobs: list[Any] = []         
         self.processed_count = 0
         self.visited_count = 0
@@ -71,7 +73,7 @@ class CountryState:
         try:
             items = articles_json
             if isinstance(articles_json, str):
-                items = json.loads(articles_json)
+                items = orjson.loads(articles_json)
             if isinstance(items, dict):
                 items = [items]
             for it in items:
@@ -156,7 +158,7 @@ class CountryState:
         try:
             self.logger.info(f"[{self.country}] Processing article...")
             # Your processors expect JSON. Wrap the single article in a list.
-            processed = self._call_processor_safely(json.dumps([job]))
+            processed = self._call_processor_safely(orjson.dumps([job]).decode())
             self.processed_count += int(processed or 0)
             self.visited_count += 1
 
@@ -171,6 +173,16 @@ class CountryState:
         self.next_process_ts = now_ts + self.process_interval
         return True
 
+    def run_to_completion(self) -> int:
+        """Fetch the RSS once and drain the queue, honouring the per-country cooldown."""
+        self.fetch_rss_if_due(monotonic())
+        while self.jobs:
+            wait = self.next_process_ts - monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self.process_one_job_if_any(monotonic())
+        return self.processed_count
+
     def close(self):
         """Close the session."""
         try:
@@ -258,6 +270,25 @@ class CooperativeScheduler:
                 self.logger.info("Demo window finished.")
                 break
 
+    def run_parallel(self, max_workers: int = None):
+        """
+        Run every country concurrently. Each country hits its own host, so there is no
+        politeness conflict across countries; jobs within a country stay sequential.
+        """
+        if not self.states:
+            return
+
+        workers = max_workers or len(self.states)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="country") as ex:
+            futures = {ex.submit(st.run_to_completion): country for country, st in self.states.items()}
+            for fut in as_completed(futures):
+                country = futures[fut]
+                try:
+                    processed = fut.result()
+                    self.logger.info(f"[{country}] finished with {processed} protests")
+                except Exception as e:
+                    self.logger.error(f"[{country}] worker failed: {e}")
+
     def _log_progress(self, elapsed_s: int):
         """Log progress information."""
         print(f"\n  Progress after {elapsed_s} seconds")
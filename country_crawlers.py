@@ -1,15 +1,17 @@
 from datetime import datetime, timezone
-import json
+from functools import lru_cache
+import orjson
 import logging
 import re
 from typing import Any
 from function import check_word_starts_with
 from check_protests import checkProtests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.html
 import requests
 from cleaning_data import Cleaner, rem_apostr
 from langdetect import detect
-from protest_keywords import PROTEST_RE, en_protest, root_words_sv
+from protest_keywords import find_greek_protest, en_protest, root_words_sv, protest_search
 from date_converter import normalize_publication_date
 from translate import throttled_get
 
@@ -22,6 +24,42 @@ logging.getLogger("requests").setLevel(logging.WARNING)
 
 cleaner = Cleaner()
 
+def stream_html_tree(url, country, session=None, timeout=10, chunk_size=16384):
+    """
+    Fetch an article page and parse it incrementally with lxml, so parsing overlaps
+    the network receive instead of waiting for the whole body to be buffered.
+    Raises requests.exceptions.RequestException on fetch/HTTP errors.
+    """
+    resp = throttled_get(url, country, timeout=timeout, session=session, stream=True)
+    try:
+        resp.raise_for_status()
+        # Only trust the declared charset; otherwise let lxml sniff the <meta> tag
+        content_type = resp.headers.get('Content-Type', '').lower()
+        encoding = resp.encoding if 'charset' in content_type else None
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        for chunk in resp.iter_content(chunk_size):
+            parser.feed(chunk)
+        return parser.close()
+    finally:
+        resp.close()
+
+# Strainer for the cheap second pass that only collects <meta> tags
+META_STRAINER = SoupStrainer('meta')
+
+def strained_soups(content, body_strainer):
+    """
+    Parse only the article body subtree and the <meta> tags instead of the full DOM.
+    Returns (body_soup, meta_soup).
+    """
+    body_soup = BeautifulSoup(content, 'lxml', parse_only=body_strainer)
+    meta_soup = BeautifulSoup(content, 'lxml', parse_only=META_STRAINER)
+    return body_soup, meta_soup
+
+def _meta_content(tree, name):
+    """Return the content attribute of <meta name=...> from an lxml tree, or ''."""
+    values = tree.xpath('//meta[@name=$name]/@content', name=name)
+    return values[0] if values else ''
+
 def first_crawling(country_url, country=None, session=None):
     candidate_articles = []
     
@@ -34,7 +72,7 @@ def first_crawling(country_url, country=None, session=None):
         if not page or not page.content:
             print(f" Empty response from {country_url}")
             logging.warning(f"Empty response from {country_url}")
-            return json.dumps(candidate_articles, ensure_ascii=False)
+            return orjson.dumps(candidate_articles).decode()
         
         soup = BeautifulSoup(page.content, 'lxml-xml')
         
@@ -42,7 +80,7 @@ def first_crawling(country_url, country=None, session=None):
         if not soup:
             print(f" Could not parse content from {country_url}")
             logging.warning(f"Could not parse content from {country_url}")
-            return json.dumps(candidate_articles, ensure_ascii=False)
+            return orjson.dumps(candidate_articles).decode()
         
         # Try to find items - support both 'url' and 'link' elements
         items = soup.find_all('url')
@@ -51,7 +89,7 @@ def first_crawling(country_url, country=None, session=None):
             if not items:
                 print(f" No 'url' or 'link' items found in {country_url}")
                 logging.warning(f"No 'url' or 'link' items found in {country_url}")
-                return json.dumps(candidate_articles, ensure_ascii=False)
+                return orjson.dumps(candidate_articles).decode()
             else:
                 print(f"📝 Found {len(items)} 'link' items in {country_url}")
         else:
@@ -143,15 +181,17 @@ def first_crawling(country_url, country=None, session=None):
     except Exception as e:
         print(f" Error in first_crawling for {country_url}: {e}")
         logging.error(f"Error in first_crawling for {country_url}: {e}")
-        return json.dumps(candidate_articles, ensure_ascii=False)
+        return orjson.dumps(candidate_articles).decode()
         
-    return json.dumps(candidate_articles, ensure_ascii=False)
+    return orjson.dumps(candidate_articles).decode()
 
 
+@lru_cache(maxsize=4096)
 def normalize_pubdate(raw_date):
     """
     CENTRALIZED date normalization function for all date parsing in crawling_countries.py
-    Handles all common date formats and returns datetime objects
+    Handles all common date formats and returns datetime objects.
+    Memoized: feeds repeat the same timestamps across items and passes.
     """
     if not raw_date or not isinstance(raw_date, str):
         return ''
@@ -215,7 +255,7 @@ def sec_crawling(url, country=None, session=None):
         if not page or not page.content:
             print(f" Empty response from {url}")
             logging.warning(f"Empty response from {url}")
-            return json.dumps(candidate_articles, ensure_ascii=False)
+            return orjson.dumps(candidate_articles).decode()
 
         soup = BeautifulSoup(page.content, 'lxml-xml')
         
@@ -223,13 +263,13 @@ def sec_crawling(url, country=None, session=None):
         if not soup:
             print(f" Could not parse content from {url}")
             logging.warning(f"Could not parse content from {url}")
-            return json.dumps(candidate_articles, ensure_ascii=False)
+            return orjson.dumps(candidate_articles).decode()
         
         source = soup.find('channel')
         if not source:
             print(f" No 'channel' found in {url}")
             logging.warning(f"No 'channel' found in {url}")
-            return json.dumps(candidate_articles, ensure_ascii=False)
+            return orjson.dumps(candidate_articles).decode()
             
         name = source.find('title').text if source.find('title') else 'Unknown Source'
         language = source.find('language').text if source.find('language') else 'en'
@@ -239,7 +279,7 @@ def sec_crawling(url, country=None, session=None):
         if not items:
             print(f" No 'item' elements found in {url}")
             logging.warning(f"No 'item' elements found in {url}")
-            return json.dumps(candidate_articles, ensure_ascii=False)
+            return orjson.dumps(candidate_articles).decode()
 
         for item in items:
             if not item:
@@ -281,9 +321,9 @@ def sec_crawling(url, country=None, session=None):
     except Exception as e:
         print(f" Error in sec_crawling for {url}: {e}")
         logging.error(f"Error in sec_crawling for {url}: {e}")
-        return json.dumps(candidate_articles, ensure_ascii=False)
+        return orjson.dumps(candidate_articles).decode()
         
-    return json.dumps(candidate_articles, ensure_ascii=False)
+    return orjson.dumps(candidate_articles).decode()
 
 def process_romania_soup(json_article_data, corpus):
     try:
@@ -291,10 +331,10 @@ def process_romania_soup(json_article_data, corpus):
         try:
             # Ensure json_article_data is a string that can be parsed
             if isinstance(json_article_data, str):
-                json_data = json.loads(json_article_data)
+                json_data = orjson.loads(json_article_data)
             else:
                 json_data = json_article_data  # If it's already parsed
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error parsing JSON data: {str(e)}")
             return 0
 
@@ -327,7 +367,7 @@ def process_romania_soup(json_article_data, corpus):
                 try:
                     content_box = article_soup.find('div', class_="realitatea-article-content-box")
                     if content_box:
-                        paragraphs = ''.join(cleaner.clean(p.text) for p in content_box.find_all('p'))
+                        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in content_box.find_all('p')))
                     else:
                         paragraphs = ''
 
@@ -352,9 +392,9 @@ def process_romania_soup(json_article_data, corpus):
                     paragraphs_words = article_data.get('paragraphs', '').lower().split()
 
                     if isinstance(corpus, re.Pattern):
-                        var1 = bool(corpus.search(article_data.get('title', '').lower()))
-                        var2 = bool(corpus.search(summary.lower()))
-                        var3 = bool(corpus.search(paragraphs.lower()))
+                        var1 = protest_search(corpus, article_data.get('title', ''))
+                        var2 = protest_search(corpus, summary)
+                        var3 = protest_search(corpus, paragraphs)
                     else:
                         corpus = set(w.lower() for w in corpus)
                         var1 = check_word_starts_with(title_words, corpus)
@@ -370,7 +410,7 @@ def process_romania_soup(json_article_data, corpus):
                         print(f"Found words in article: {', '.join(found_words)}")
                     print(article_data.get('title', ''))
                     if var1 or var2 or var3:
-                        result = checkProtests(json.dumps(article_data))
+                        result = checkProtests(orjson.dumps(article_data).decode())
                         if result:  # Only extend if checkProtests returned valid data
                             ProtestData.append(result)
                             processed_count += 1
@@ -394,7 +434,7 @@ def process_romania_soup(json_article_data, corpus):
         return 0
 
 def process_luxembourg_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     print(json_data)
     processed_count = 0
 
@@ -441,16 +481,16 @@ def process_luxembourg_soup(json_article_data, corpus):
             article_data['publication_date'] = date_published
 
             if isinstance(corpus, re.Pattern):
-                var1 = bool(corpus.search(article_data.get('title', '').lower()))
-                var2 = bool(corpus.search(summary.lower()))
-                var3 = bool(corpus.search(paragraphs.lower()))
+                var1 = protest_search(corpus, article_data.get('title', ''))
+                var2 = protest_search(corpus, summary)
+                var3 = protest_search(corpus, paragraphs)
             else:
                 var1 = check_word_starts_with(article_data['title'].lower().split(), corpus)
                 var2 = check_word_starts_with(summary.lower().split(), corpus)
                 var3 = check_word_starts_with(paragraphs.lower().split(), corpus)
 
             if var1 or var2 or var3:
-                checkProtests(json.dumps(article_data))
+                checkProtests(orjson.dumps(article_data).decode())
                 processed_count += 1
                 print(f"✔ Processed: {article_data['title']}")
             else:
@@ -464,7 +504,7 @@ def process_luxembourg_soup(json_article_data, corpus):
     return processed_count
 
 def process_germany_soup(json_article_data, corpus, session=None):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -500,9 +540,9 @@ def process_germany_soup(json_article_data, corpus, session=None):
         article_data['country'] = 'Germany'
  
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -514,7 +554,7 @@ def process_germany_soup(json_article_data, corpus, session=None):
 
         print(article_data.get('title', ''))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data.get('title', '')}")
 
@@ -522,7 +562,7 @@ def process_germany_soup(json_article_data, corpus, session=None):
     return processed_count
 
 def process_austria_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -534,19 +574,20 @@ def process_austria_soup(json_article_data, corpus):
             print(f"Error fetching {url}: {e}")
             continue
 
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(
+            article_page.content, SoupStrainer('div', class_='box col-xs-12 c_content'))
 
         article_ = article_soup.find('div', class_='box col-xs-12 c_content')
         article = article_.find_all('p') if article_ else ''
-        paragraphs = ''.join(cleaner.clean(p.text if hasattr(p, 'text') else p) for p in article) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) if hasattr(p, 'get_text') else p for p in article)) if article else ''
 
-        summ = article_soup.find('meta', attrs={'name': 'description'})
+        summ = meta_soup.find('meta', attrs={'name': 'description'})
         summary = cleaner.clean(summ.get('content', '')) if summ else ''
 
-        tag_div = article_soup.find('meta', attrs={'name': 'keywords'})
+        tag_div = meta_soup.find('meta', attrs={'name': 'keywords'})
         tags = tag_div.get('content', '') if tag_div else ''
 
-        au = article_soup.find('meta', attrs={'name': 'author'})
+        au = meta_soup.find('meta', attrs={'name': 'author'})
         author = au.get('content', '') if au else ''
 
         print(f"📄 Processing: {url}")
@@ -560,9 +601,9 @@ def process_austria_soup(json_article_data, corpus):
         article_data['country'] = 'Austria'
  
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -575,7 +616,7 @@ def process_austria_soup(json_article_data, corpus):
         print(article_data.get('url', ''))
         print(article_data.get('title', ''))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data.get('title', '')}")
 
@@ -583,7 +624,7 @@ def process_austria_soup(json_article_data, corpus):
     return processed_count
 
 def process_greece_soup(json_article_data):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -595,15 +636,16 @@ def process_greece_soup(json_article_data):
             print(f"Error fetching {url}: {e}")
             continue
 
-        soup = BeautifulSoup(page.content, "html.parser")
+        soup, meta_soup = strained_soups(
+            page.content, SoupStrainer("div", class_="post-body main-content pos-rel article-wrapper"))
 
         content = soup.find("div", class_="post-body main-content pos-rel article-wrapper")
         paragraphs = rem_apostr(content.get_text()) if content else ""
 
-        summary_tag = soup.find("meta", attrs={'name': 'description'})
+        summary_tag = meta_soup.find("meta", attrs={'name': 'description'})
         summary = rem_apostr(summary_tag.get('content', '')) if summary_tag else ''
 
-        au = soup.find('meta', attrs={'name': 'description'})
+        au = meta_soup.find('meta', attrs={'name': 'description'})
         author = au.get('content', '') if au else ''
 
         print(f"📄 Processing: {url}")
@@ -617,17 +659,13 @@ def process_greece_soup(json_article_data):
             "country": "Greece"
         })
 
-        title_up = article_data.get("title", "").upper()
-        summary_up = summary.upper()
-        paras_up = paragraphs.upper()
-
-        var1 = bool(PROTEST_RE.search(title_up))
-        var2 = bool(PROTEST_RE.search(summary_up))
-        var3 = bool(PROTEST_RE.search(paras_up))
+        var1 = bool(find_greek_protest(article_data.get("title", "")))
+        var2 = bool(find_greek_protest(summary))
+        var3 = bool(find_greek_protest(paragraphs))
 
         print(url, article_data.get("title", "No title"))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data.get('title', 'No title')}")
 
@@ -636,7 +674,7 @@ def process_greece_soup(json_article_data):
 
 def process_cyprus_soup(json_article_data):
     print(json_article_data)
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -648,13 +686,13 @@ def process_cyprus_soup(json_article_data):
             print(f"Error fetching {url}: {e}")
             continue
 
-        soup = BeautifulSoup(page.content, "html.parser")
+        soup, meta_soup = strained_soups(page.content, SoupStrainer("div", class_="article-body"))
 
         content = soup.find("div", class_="article-body")
         paragraphs = ' '.join(rem_apostr(p.text) for p in content.find_all('p')) if content else ""
-        summ = soup.find('meta', attrs={'name': 'description'})
+        summ = meta_soup.find('meta', attrs={'name': 'description'})
         summary = rem_apostr(summ.get('content', '')) if summ else ''
-        au = soup.find('meta', attrs={'name': 'author'})
+        au = meta_soup.find('meta', attrs={'name': 'author'})
         author = au.get('content', '') if au else ''
         
         # Check if we have any content before proceeding
@@ -673,17 +711,13 @@ def process_cyprus_soup(json_article_data):
             "country": "Cyprus"
         })
 
-        title_up = article_data.get("title", "").upper()
-        summary_up = summary.upper()
-        paras_up = paragraphs.upper()
-
-        var1 = bool(PROTEST_RE.search(title_up))
-        var2 = bool(PROTEST_RE.search(summary_up))
-        var3 = bool(PROTEST_RE.search(paras_up))
+        var1 = bool(find_greek_protest(article_data.get("title", "")))
+        var2 = bool(find_greek_protest(summary))
+        var3 = bool(find_greek_protest(paragraphs))
 
         print(url, article_data.get("title", "No title"))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data.get('title', 'No title')}")
 
@@ -691,7 +725,7 @@ def process_cyprus_soup(json_article_data):
     return processed_count
 
 def process_italy_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -706,7 +740,7 @@ def process_italy_soup(json_article_data, corpus):
         article_soup = BeautifulSoup(article_page.content, 'html.parser')
 
         article = article_soup.find('div', class_='story__text')
-        paragraphs = ' '.join(cleaner.clean(p.get_text(strip=True)) for p in article.find_all('p')) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(strip=True) for p in article.find_all('p'))) if article else ''
 
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
@@ -730,9 +764,9 @@ def process_italy_soup(json_article_data, corpus):
         article_data['country'] = 'Italy'
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data.get('title', '').lower().split()
             summary_words = article_data.get('summary', '').lower().split()
@@ -743,7 +777,7 @@ def process_italy_soup(json_article_data, corpus):
             var3 = check_word_starts_with(paragraphs_words, corpus)
         print(article_data.get('title', ''))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data.get('title', '')}")
 
@@ -751,7 +785,7 @@ def process_italy_soup(json_article_data, corpus):
     return processed_count
 
 def process_france_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -766,7 +800,7 @@ def process_france_soup(json_article_data, corpus):
         article_soup = BeautifulSoup(article_page.content, 'html.parser')
 
         article = article_soup.find_all('p', class_='article__paragraph')
-        paragraphs = ' '.join(cleaner.clean(paragraph.text) for paragraph in article) if article else ''
+        paragraphs = cleaner.clean(' '.join(paragraph.get_text(' ', strip=True) for paragraph in article)) if article else ''
 
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
@@ -788,9 +822,9 @@ def process_france_soup(json_article_data, corpus):
         # print(url, '\n', author, '\n', summary, '\n', paragraphs, '\n', tags, '\n')
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -803,7 +837,7 @@ def process_france_soup(json_article_data, corpus):
         print(article_data.get('url', ''))
         print(article_data.get('title', ''))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data.get('title', '')}")
 
@@ -811,7 +845,7 @@ def process_france_soup(json_article_data, corpus):
     return processed_count
 
 def process_portugal_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -826,7 +860,7 @@ def process_portugal_soup(json_article_data, corpus):
         article_soup = BeautifulSoup(article_page.content, 'html.parser')
 
         article = article_soup.find('div', class_='story__body')
-        paragraphs = ' '.join(cleaner.clean(p.get_text(strip=True)) for p in article.find_all('p')) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(strip=True) for p in article.find_all('p'))) if article else ''
 
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
@@ -848,9 +882,9 @@ def process_portugal_soup(json_article_data, corpus):
         # print(url, '\n', author, '\n', summary, '\n', paragraphs, '\n', tags, '\n')
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -863,7 +897,7 @@ def process_portugal_soup(json_article_data, corpus):
         print(article_data['url'])
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
 
@@ -871,7 +905,7 @@ def process_portugal_soup(json_article_data, corpus):
     return processed_count
 
 def process_malta_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -891,7 +925,7 @@ def process_malta_soup(json_article_data, corpus):
         author = au.get('content', '') if au else ''
         main = article_soup.find('div', class_='ar-Article_Main').find_all('p') if article_soup.find('div',
                                                                                                      class_='ar-Article_Main') else ''
-        paragraphs = ''.join(cleaner.clean(p.text) for p in main)
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in main))
         tags = [btn.get_text(strip=True) for btn in article_soup.select('.wi-WidgetKeywords-container button.light')]
 
         keywords = ', '.join(tags)
@@ -906,9 +940,9 @@ def process_malta_soup(json_article_data, corpus):
   
         print(url, '\n', author, '\n', summary, '\n', paragraphs, '\n')
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -921,7 +955,7 @@ def process_malta_soup(json_article_data, corpus):
         print(article_data['url'])
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
 
@@ -929,7 +963,7 @@ def process_malta_soup(json_article_data, corpus):
     return processed_count
 
 def process_poland_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -945,13 +979,13 @@ def process_poland_soup(json_article_data, corpus):
 
         script_tag = article_soup.find('script', {'id': 'authors-ld', 'type': 'application/ld+json'})
         if script_tag:
-            data = json.loads(script_tag.string)
+            data = orjson.loads(script_tag.string)
             author = data["@graph"][0]["name"]
         else:
             author = "Anonymous"
 
         article = article_soup.find_all('p', class_="articleBodyBlock article--paragraph")
-        paragraphs = ' '.join(cleaner.clean(p.get_text()) for p in article) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in article)) if article else ''
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
         tag = article_soup.find('meta', attrs={'property': 'mrf:tags'})
@@ -967,9 +1001,9 @@ def process_poland_soup(json_article_data, corpus):
         # print(url, '\n', author, '\n', summary, '\n', paragraphs, '\n', tags, '\n')
 
         if isinstance(en_protest, re.Pattern):
-            var1 = bool(en_protest.search(article_data.get('title', '').lower()))
-            var2 = bool(en_protest.search(article_data.get('summary', '').lower()))
-            var3 = bool(en_protest.search(paragraphs.lower()))
+            var1 = protest_search(en_protest, article_data.get('title', ''))
+            var2 = protest_search(en_protest, article_data.get('summary', ''))
+            var3 = protest_search(en_protest, paragraphs)
         else:
             title_words = article_data.get('title', '').lower().split()
             summary_words = article_data.get('summary', '').lower().split()
@@ -984,14 +1018,14 @@ def process_poland_soup(json_article_data, corpus):
         print(article_data['url'])
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
     print(f"Total processed articles: {processed_count}")
     return processed_count
 
 def process_finland_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1012,9 +1046,9 @@ def process_finland_soup(json_article_data, corpus):
         paragraphs = ''
         if text:
             if isinstance(text, list):
-                paragraphs = ''.join(cleaner.clean(p.text if hasattr(p, 'text') else '') for p in text)
+                paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in text if hasattr(p, 'get_text')))
             else:
-                paragraphs = ''.join(cleaner.clean(p.text if hasattr(p, 'text') else '') for p in text.find_all('p'))
+                paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in text.find_all('p')))
 
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
@@ -1036,9 +1070,9 @@ def process_finland_soup(json_article_data, corpus):
         article_data['publication_date'] = date_published
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1051,14 +1085,14 @@ def process_finland_soup(json_article_data, corpus):
         print(article_data['url'])
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
     print(f"Total processed articles: {processed_count}")
     return processed_count
 
 def process_croatia_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1074,8 +1108,8 @@ def process_croatia_soup(json_article_data, corpus):
 
         article = article_soup.find('div', 'article__content article_content_container') or article_soup.find('div',
                                                                                                               class_='article__lead_text')
-        paragraphs = ' '.join(cleaner.clean(p.get_text()) for p in
-                              article.find_all('p')) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in
+                                             article.find_all('p'))) if article else ''
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
 
@@ -1094,9 +1128,9 @@ def process_croatia_soup(json_article_data, corpus):
         print(f"📄 Processing: {url}")
         print("=" * 80)
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(summary.lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, summary)
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1109,7 +1143,7 @@ def process_croatia_soup(json_article_data, corpus):
         print(article_data['url'])
         print(article_data['title'])
         if var1 or var2 or var3:
-            data1, data2 = checkProtests(json.dumps(article_data))
+            data1, data2 = checkProtests(orjson.dumps(article_data).decode())
             processed_count += len(data1)
             print(f"Processed article: {article_data['title']}")
 
@@ -1117,7 +1151,7 @@ def process_croatia_soup(json_article_data, corpus):
     return processed_count
 
 def process_denmark_soup(json_article_data, corpus, session=None):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1132,8 +1166,8 @@ def process_denmark_soup(json_article_data, corpus, session=None):
         article_soup = BeautifulSoup(article_page.content, 'html.parser')
 
         article = article_soup.find('main', class_='article-content')
-        paragraphs = ' '.join(cleaner.clean(p.get_text()) for p in
-                              article.find_all('p')) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in
+                                             article.find_all('p'))) if article else ''
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
         tags = cleaner.clean(article_soup.find('div', class_='article-meta').find(
@@ -1157,9 +1191,9 @@ def process_denmark_soup(json_article_data, corpus, session=None):
         print(f"📄 Processing: {url}")
         print("=" * 80)
         if isinstance(en_protest, re.Pattern):
-            var1 = bool(en_protest.search(article_data.get('title', '').lower()))
-            var2 = bool(en_protest.search(article_data.get('summary', '').lower()))
-            var3 = bool(en_protest.search(paragraphs.lower()))
+            var1 = protest_search(en_protest, article_data.get('title', ''))
+            var2 = protest_search(en_protest, article_data.get('summary', ''))
+            var3 = protest_search(en_protest, paragraphs)
         else:
             title_words = article_data.get('title', '').lower().split()
             summary_words = article_data.get('summary', '').lower().split()
@@ -1170,7 +1204,7 @@ def process_denmark_soup(json_article_data, corpus, session=None):
             var3 = check_word_starts_with(paragraphs_words, corpus)
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
 
@@ -1178,7 +1212,7 @@ def process_denmark_soup(json_article_data, corpus, session=None):
     return processed_count
 
 def process_estonia_soup(json_article_data, corpus, session=None):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1190,15 +1224,16 @@ def process_estonia_soup(json_article_data, corpus, session=None):
             print(f"Error fetching {url}: {e}")
             continue
 
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(
+            article_page.content, SoupStrainer('div', class_="fragment fragment-html fragment-html--paragraph"))
 
-        summ = article_soup.find('meta', attrs={'name': 'description'})
+        summ = meta_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
         art = article_soup.find('div', class_="fragment fragment-html fragment-html--paragraph")
         paragraphs = ' '.join(p.text for p in art) if art else ""
-        authorr = article_soup.find('meta', attrs={'name': 'cXenseParse:author'})
+        authorr = meta_soup.find('meta', attrs={'name': 'cXenseParse:author'})
         author = authorr.get('content', '') if authorr else ''
-        tags = article_soup.find('meta', attrs={'name': 'keywords'})
+        tags = meta_soup.find('meta', attrs={'name': 'keywords'})
         tag = tags.get('content', '') if tags else ''
         article_data['author'] = author
         article_data['summary'] = summary
@@ -1209,9 +1244,9 @@ def process_estonia_soup(json_article_data, corpus, session=None):
         print(f"📄 Processing: {url}")
         print("=" * 80)
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1222,7 +1257,7 @@ def process_estonia_soup(json_article_data, corpus, session=None):
             var3 = check_word_starts_with(paragraphs_words, corpus)
         # print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
 
@@ -1230,7 +1265,7 @@ def process_estonia_soup(json_article_data, corpus, session=None):
     return processed_count
 
 def process_bulgaria_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1242,16 +1277,16 @@ def process_bulgaria_soup(json_article_data, corpus):
             print(f"Error fetching {url}: {e}")
             continue
 
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(article_page.content, SoupStrainer('div', class_='post-content'))
 
         article = article_soup.find('div', class_='post-content')
         paragraphs = ''.join(p.get_text(strip=True) for p in article.find_all('p')) if hasattr(article, 'p') else ''
 
-        tit = article_soup.find('meta', attrs={'name': 'title'})
+        tit = meta_soup.find('meta', attrs={'name': 'title'})
         title = tit.get('content', '') if tit else ''
-        summ = article_soup.find('meta', attrs={'name': 'description'})
+        summ = meta_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
-        auth = article_soup.find('meta', attrs={'name': 'author'})
+        auth = meta_soup.find('meta', attrs={'name': 'author'})
         author = auth.get('content', '') if auth else ''
 
         article_data['author'] = author
@@ -1273,7 +1308,7 @@ def process_bulgaria_soup(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
 
@@ -1281,7 +1316,7 @@ def process_bulgaria_soup(json_article_data, corpus):
     return processed_count
 
 def process_belgium_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1293,13 +1328,14 @@ def process_belgium_soup(json_article_data, corpus):
             print(f"Error fetching {url}: {e}")
             continue
 
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(
+            article_page.content, SoupStrainer('div', class_="fragment fragment-html fragment-html--paragraph"))
 
-        summ = article_soup.find('meta', attrs={'name': 'description'})
+        summ = meta_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
         art = article_soup.find('div', class_="fragment fragment-html fragment-html--paragraph")
         paragraphs = ' '.join(p.text for p in art) if art else ""
-        authorr = article_soup.find('meta', attrs={'name': 'author'})
+        authorr = meta_soup.find('meta', attrs={'name': 'author'})
         author = authorr.get('content', '') if authorr else ''
 
         article_data['author'] = author
@@ -1312,9 +1348,9 @@ def process_belgium_soup(json_article_data, corpus):
         print("=====================\n")
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1325,7 +1361,7 @@ def process_belgium_soup(json_article_data, corpus):
             var3 = check_word_starts_with(paragraphs_words, corpus)
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
             processed_count += 1
             print(f"Processed article: {article_data['title']}")
 
@@ -1333,7 +1369,7 @@ def process_belgium_soup(json_article_data, corpus):
     return processed_count
 
 def process_netherlands_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1348,10 +1384,10 @@ def process_netherlands_soup(json_article_data, corpus):
         article_soup = BeautifulSoup(article_page.content, 'html.parser')
 
         article = article_soup.find_all('p', class_='z3lfzo5 z3lfzo0 _1iobnq20')
-        paragraphs = ''.join(cleaner.clean(p.text) for p in article) if article else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in article)) if article else ''
 
         tag = article_soup.find_all('span', class_="_1o954t80 _13ybfml0 _13ybfml1")
-        tags = ''.join(cleaner.clean(p.text) for p in tag) if tag else ''
+        tags = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in tag)) if tag else ''
 
         summ = article_soup.find('meta', attrs={'name': 'description'})
         summary = summ.get('content', '') if summ else ''
@@ -1367,9 +1403,9 @@ def process_netherlands_soup(json_article_data, corpus):
         article_data['country'] = 'Netherlands'
   
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1381,7 +1417,7 @@ def process_netherlands_soup(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            data1, data2 = checkProtests(json.dumps(article_data))
+            data1, data2 = checkProtests(orjson.dumps(article_data).decode())
             processed_count += len(data1)
             print(f"Processed article: {article_data['title']}")
 
@@ -1389,27 +1425,22 @@ def process_netherlands_soup(json_article_data, corpus):
     return processed_count
 
 def process_czech_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
         url = article_data.get('url', '')
         try:
-            article_page = throttled_get(url, "czech", timeout=10)
-            article_page.raise_for_status()
-        except requests.exceptions.RequestException as e:
+            tree = stream_html_tree(url, "czech", timeout=10)
+        except (requests.exceptions.RequestException, lxml.etree.LxmlError) as e:
             print(f"Error fetching {url}: {e}")
             continue
 
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
-
-        text = article_soup.find('div', class_='content')
-        paragraphs = ''.join(cleaner.clean(p.text) for p in text.find_all('p')) if text else ''
+        text = tree.xpath('(//div[contains(concat(" ", normalize-space(@class), " "), " content ")])[1]//p')
+        paragraphs = cleaner.clean(' '.join(p.text_content().strip() for p in text))
 
-        summ = article_soup.find('meta', attrs={'name': 'description'})
-        summary = summ.get('content', '') if summ else ''
-        auth = article_soup.find('meta', attrs={'name': 'author'})
-        author = auth.get('content', '') if auth else ''
+        summary = _meta_content(tree, 'description')
+        author = _meta_content(tree, 'author')
         
 
         print(f"📄 Processing: {url}")
@@ -1430,7 +1461,7 @@ def process_czech_soup(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            data1, data2 = checkProtests(json.dumps(article_data))
+            data1, data2 = checkProtests(orjson.dumps(article_data).decode())
             processed_count += len(data1)
             print(f"Processed article: {article_data['title']}")
 
@@ -1438,7 +1469,7 @@ def process_czech_soup(json_article_data, corpus):
     return processed_count
 
 def process_lithuania_soup(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     processed_count = 0
 
     for article_data in json_data:
@@ -1457,7 +1488,7 @@ def process_lithuania_soup(json_article_data, corpus):
         )
         if article_div:
             paras = article_div.find_all('p')
-            paragraphs = ' '.join(p.get_text(strip=True) for p in paras)
+            paragraphs = cleaner.clean(' '.join(p.get_text(strip=True) for p in paras))
         else:
             paragraphs = ''
 
@@ -1495,9 +1526,9 @@ def process_lithuania_soup(json_article_data, corpus):
 
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1509,7 +1540,7 @@ def process_lithuania_soup(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            data1, data2 = checkProtests(json.dumps(article_data))
+            data1, data2 = checkProtests(orjson.dumps(article_data).decode())
             processed_count += len(data1)
             print(f"Processed article: {article_data['title']}")
 
@@ -1604,9 +1635,9 @@ def slovenia_crawling():
         }
 
         if isinstance(en_protest, re.Pattern):
-            var1 = bool(en_protest.search(title.lower()))
-            var2 = bool(en_protest.search(description.lower()))
-            var3 = bool(en_protest.search(article.lower()))
+            var1 = protest_search(en_protest, title)
+            var2 = protest_search(en_protest, description)
+            var3 = protest_search(en_protest, article)
         else:
             title_words = title.lower().split()
             summary_words = description.lower().split()
@@ -1618,10 +1649,10 @@ def slovenia_crawling():
 
         print(title)
         if var1 or var2 or var3:
-            checkProtests(json.dumps(json_rss))
+            checkProtests(orjson.dumps(json_rss).decode())
 
 def ireland_crawling(json_article_data):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     for article_data in json_data:
         url = article_data.get('url', '')
         print(url)
@@ -1667,9 +1698,9 @@ def ireland_crawling(json_article_data):
         }
 
         if isinstance(en_protest, re.Pattern):
-            var1 = bool(en_protest.search(article_data.get('title', '').lower()))
-            var2 = bool(en_protest.search(article_data.get('summary', '').lower()))
-            var3 = bool(en_protest.search(paragraphs.lower()))
+            var1 = protest_search(en_protest, article_data.get('title', ''))
+            var2 = protest_search(en_protest, article_data.get('summary', ''))
+            var3 = protest_search(en_protest, paragraphs)
         else:
             title_words = article_data.get('title', '').lower().split()
             summary_words = article_data.get('summary', '').lower().split()
@@ -1681,15 +1712,17 @@ def ireland_crawling(json_article_data):
 
         print(article_data.get('title', ''))
         if var1 or var2 or var3:
-            checkProtests(json.dumps(json_rss))
+            checkProtests(orjson.dumps(json_rss).decode())
 
 def hungary_crawling(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
 
     for article_data in json_data:
         url = article_data.get('url', '')
         article_page = throttled_get(url, "hungary")
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        # Body and date share the itemprop attribute, so one strained parse covers both
+        article_soup = BeautifulSoup(article_page.content, 'lxml',
+                                     parse_only=SoupStrainer(itemprop=['articleBody', 'datePublished']))
 
         paragraphs = ''.join(
             p.text for p in article_soup.find('div', itemprop="articleBody").find_all('p')
@@ -1699,10 +1732,13 @@ def hungary_crawling(json_article_data, corpus):
         time_ = article_soup.find('p', itemprop='datePublished')
         publication_date = time_.text if time_ else ''
         if not publication_date:
-            scripts = article_soup.find_all("script", type="application/ld+json")
+            # JSON-LD is only needed as a fallback, so parse the scripts lazily
+            script_soup = BeautifulSoup(article_page.content, 'lxml',
+                                        parse_only=SoupStrainer("script", type="application/ld+json"))
+            scripts = script_soup.find_all("script", type="application/ld+json")
             for script in scripts:
                 try:
-                    data = json.loads(script.string)
+                    data = orjson.loads(script.string)
                     if isinstance(data, list):
                         for item in data:
                             if item.get("@type") == "NewsArticle":
@@ -1710,7 +1746,7 @@ def hungary_crawling(json_article_data, corpus):
                                 break
                     elif data.get("@type") == "NewsArticle":
                         publication_date = data.get("datePublished", '')
-                except (json.JSONDecodeError, TypeError):
+                except (orjson.JSONDecodeError, TypeError):
                     continue
         try:
             publication_date = normalize_pubdate(publication_date)
@@ -1729,9 +1765,9 @@ def hungary_crawling(json_article_data, corpus):
         print("=" * 80)
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1743,10 +1779,10 @@ def hungary_crawling(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
 
 def spain_crawling(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
 
     for article_data in json_data:
         url = article_data.get('url', '')
@@ -1755,8 +1791,8 @@ def spain_crawling(json_article_data, corpus):
             article_soup = BeautifulSoup(article_page.content, 'html.parser')
 
             article = article_soup.find('div', class_='a_c clearfix')
-            paragraphs = ''.join(
-                x.text for x in article.find_all('p')) if article else ''
+            paragraphs = cleaner.clean(' '.join(
+                x.get_text(' ', strip=True) for x in article.find_all('p'))) if article else ''
 
             # tags = article_soup.find('div', class_="cs_t").text if article_soup.find('div', class_="cs_t") else ''
 
@@ -1779,9 +1815,9 @@ def spain_crawling(json_article_data, corpus):
             article_data['country'] = 'Spain'
 
             if isinstance(corpus, re.Pattern):
-                var1 = bool(corpus.search(article_data.get('title', '').lower()))
-                var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-                var3 = bool(corpus.search(paragraphs.lower()))
+                var1 = protest_search(corpus, article_data.get('title', ''))
+                var2 = protest_search(corpus, article_data.get('summary', ''))
+                var3 = protest_search(corpus, paragraphs)
             else:
                 title_words = article_data['title'].lower().split()
                 summary_words = article_data['summary'].lower().split()
@@ -1793,22 +1829,22 @@ def spain_crawling(json_article_data, corpus):
 
             print(article_data['title'])
             if var1 or var2 or var3:
-                checkProtests(json.dumps(article_data))
+                checkProtests(orjson.dumps(article_data).decode())
         except Exception as e:
             print(f"Error processing article {url}: {str(e)}")
             continue
 
 def sweden_crawling(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
 
     for article_data in json_data:
         url = article_data.get('url', '')
         article_page = throttled_get(url, "sweden")
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(article_page.content, SoupStrainer('div', class_='sc-bf0483d0-1 kgpqAW'))
 
         article = article_soup.find('div', class_='sc-bf0483d0-1 kgpqAW')
-        paragraphs = ''.join(article.text) if article else ''
-        au = article_soup.find('meta', attrs={'property': 'article:author'})
+        paragraphs = cleaner.clean(article.get_text(' ', strip=True)) if article else ''
+        au = meta_soup.find('meta', attrs={'property': 'article:author'})
         author = au.get('content', '') if au else 'Anonymous'
 
         article_data['paragraphs'] = paragraphs
@@ -1820,9 +1856,9 @@ def sweden_crawling(json_article_data, corpus):
         print("=====================\n")
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1834,26 +1870,25 @@ def sweden_crawling(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            # Convert datetime to ISO string before JSON serialization
-            article_data_for_json = article_data.copy()
-            if isinstance(article_data_for_json.get('publication_date'), datetime):
-                # Keep as datetime object - no conversion needed
-            checkProtests(json.dumps(article_data_for_json))
+            # orjson serializes datetime natively, no copy-and-convert needed
+            checkProtests(orjson.dumps(article_data).decode())
 
 def slovakia_crawling(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
 
     for article_data in json_data:
         url = article_data.get('url', '')
         article_page = throttled_get(url, "slovakia")
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(
+            article_page.content,
+            SoupStrainer('article', class_='js-remp-article-data cf js-font-resize js-article-stats-item'))
 
         article = article_soup.find('article',
                                     class_='js-remp-article-data cf js-font-resize js-article-stats-item')
-        paragraphs = ''.join(p.text for p in article.find_all('p')) if article else ''
-        au = article_soup.find('meta', attrs={'name': 'author'})
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in article.find_all('p'))) if article else ''
+        au = meta_soup.find('meta', attrs={'name': 'author'})
         author = au.get('content', '') if au else 'Anonymous'
-        key = article_soup.find('meta', attrs={'name': 'keywords'})
+        key = meta_soup.find('meta', attrs={'name': 'keywords'})
         keywords = key.get('content', '') if key else ''
         print(url)
         print("=====================\n")
@@ -1861,30 +1896,18 @@ def slovakia_crawling(json_article_data, corpus):
         article_data['keywords'] = keywords
         article_data['author'] = author
         article_data['country'] = 'Slovakia'
-        # Check if publication_date is already in ISO format
-        if isinstance(article_data['publication_date'], str):
-            if 'T' in article_data['publication_date']:
-                # Already in ISO format
-                try:
-                    publication_date = normalize_pubdate(article_data['publication_date'])
-                except ValueError:
-                    publication_date = article_data['publication_date']
-            else:
-                # Try to parse as RSS format
-                try:
-                    publication_date = normalize_pubdate(article_data['publication_date'])
-                except ValueError:
-                    publication_date = article_data['publication_date']
-        else:
-            publication_date = article_data['publication_date']
+        # normalize_pubdate handles both ISO and RSS formats
+        publication_date = article_data['publication_date']
+        if isinstance(publication_date, str):
+            publication_date = normalize_pubdate(publication_date)
         
         article_data['publication_date'] = publication_date
 
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1896,46 +1919,29 @@ def slovakia_crawling(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            # Convert datetime to ISO string before JSON serialization
-            article_data_for_json = article_data.copy()
-            if isinstance(article_data_for_json.get('publication_date'), datetime):
-                # Keep as datetime object - no conversion needed
-            checkProtests(json.dumps(article_data_for_json))
+            # orjson serializes datetime natively, no copy-and-convert needed
+            checkProtests(orjson.dumps(article_data).decode())
 
 def latvia_crawling(json_article_data, corpus):
-    json_data = json.loads(json_article_data)
+    json_data = orjson.loads(json_article_data)
     for article_data in json_data:
         url = article_data.get('url', '')
         print(url)
         article_page = throttled_get(url, "latvia")
-        article_soup = BeautifulSoup(article_page.content, 'html.parser')
+        article_soup, meta_soup = strained_soups(article_page.content, SoupStrainer('section', class_="block article__body"))
 
-        tags = article_soup.find('meta', attrs={'name': 'keywords'})
+        tags = meta_soup.find('meta', attrs={'name': 'keywords'})
         tag = tags.get('content', '') if tags else ''
         paragraph = article_soup.find('section', class_="block article__body")
-        paragraphs = ''.join(p.text for p in paragraph.find_all('p')) if paragraph else ''
+        paragraphs = cleaner.clean(' '.join(p.get_text(' ', strip=True) for p in paragraph.find_all('p'))) if paragraph else ''
         article_data['paragraphs'] = paragraphs
         article_data['keywords'] = tag
-        # Handle publication_date - check if it's already in ISO format
-        if isinstance(article_data['publication_date'], str):
-            if 'T' in article_data['publication_date']:
-                # Already in ISO format
-                try:
-                    dt = normalize_pubdate(article_data['publication_date'])
-                    # Keep as datetime object
-                except ValueError:
-                    iso_format = article_data['publication_date']
-            else:
-                # Try to parse as RSS format
-                try:
-                    dt = normalize_pubdate(article_data['publication_date'])
-                    # Keep as datetime object
-                except ValueError:
-                    iso_format = article_data['publication_date']
-        else:
-            iso_format = article_data['publication_date']
+        # normalize_pubdate handles both ISO and RSS formats; keep as datetime object
+        publication_date = article_data['publication_date']
+        if isinstance(publication_date, str):
+            publication_date = normalize_pubdate(publication_date)
         
-        article_data['publication_date'] = iso_format
+        article_data['publication_date'] = publication_date
         article_data['author'] = 'Anonymous'
         article_data['country'] = 'Latvia'
 
@@ -1943,9 +1949,9 @@ def latvia_crawling(json_article_data, corpus):
         print("=====================\n")
 
         if isinstance(corpus, re.Pattern):
-            var1 = bool(corpus.search(article_data.get('title', '').lower()))
-            var2 = bool(corpus.search(article_data.get('summary', '').lower()))
-            var3 = bool(corpus.search(paragraphs.lower()))
+            var1 = protest_search(corpus, article_data.get('title', ''))
+            var2 = protest_search(corpus, article_data.get('summary', ''))
+            var3 = protest_search(corpus, paragraphs)
         else:
             title_words = article_data['title'].lower().split()
             summary_words = article_data['summary'].lower().split()
@@ -1957,5 +1963,5 @@ def latvia_crawling(json_article_data, corpus):
 
         print(article_data['title'])
         if var1 or var2 or var3:
-            checkProtests(json.dumps(article_data))
+            checkProtests(orjson.dumps(article_data).decode())
 
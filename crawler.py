@@ -7,7 +7,7 @@ import logging
 from time import monotonic
 
 from cooperative_scheduler import CooperativeScheduler
-from config import logger
+from config import CRAWL_MAX_WORKERS, logger
 
 # ===================== CRAWLING FUNCTIONS =====================
 
@@ -15,6 +15,7 @@ def run_single_pass_all_countries():
     scheduler = CooperativeScheduler()
     try:
         print("Loaded countries:", ", ".join(sorted(scheduler.states.keys())))
+        scheduler.run_parallel(max_workers=CRAWL_MAX_WORKERS or None)
 
         final_stats = scheduler.get_stats()
         print("\n FINAL STATISTICS")
@@ -4,11 +4,39 @@ Contains MongoDB operations, data transfer functions, and database utilities.
 """
 
 import logging
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from pymongo import UpdateOne, DESCENDING
-
-from config import get_database_connections, logger
-from utils import is_eu_country, normalize_article_dates_for_database
+from bson.codec_options import CodecOptions
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import UpdateMany, UpdateOne, DESCENDING
+
+try:
+    import hyperscan  # optional: multi-pattern scanning in a single pass
+except ImportError:
+    hyperscan = None
+
+from config import (CONNECTION_STRING, EU_COUNTRIES, EXTRACT_SHARD_COUNT, EXTRACT_SHARD_INDEX,
+                    EXTRACT_WINDOW_END, get_database_connections, logger)
+from processor import process_article_locations_and_countries
+from utils import (NO_PARTICIPANT_COUNTS, PARTICIPANT_CUE_PATTERN, extract_participant_count,
+                   normalize_article_dates_for_database)
+
+# Documents per cursor batch and per bulk_write flush
+BULK_BATCH_SIZE = 500
+
+# Raw/internal fields never copied into the analysis collection
+DROP_KEYS = frozenset({
+    '_id', 'title', 'summary', 'content', 'label',
+    'keywords', 'name', 'article', 'lastmod'
+})
+
+# Date fields normalized to datetime before they reach the analysis/final collections
+DATE_FIELDS = ('publication_date', 'lastmod', 'created_at', 'updated_at', 'imported_at')
 
 # ===================== DATABASE SETUP =====================
 
@@ -20,16 +48,19 @@ def setup_unique_indexes():
         # Main collection
         collections['main'].create_index('url', unique=True, sparse=True)
         collections['main'].create_index('content_hash', unique=True, sparse=True)
+        collections['main'].create_index([('imported_at', DESCENDING), ('prediction', 1)])
         
         # Analysis collection
         collections['analysis'].create_index('url', unique=True, sparse=True)
         collections['analysis'].create_index('content_hash', unique=True, sparse=True)
+        collections['analysis'].create_index([('imported_at', DESCENDING), ('country', 1)])
         
         # Final collection
         collections['final'].create_index('url', unique=True, sparse=True)
         collections['final'].create_index('content_hash', unique=True, sparse=True)
+        collections['final'].create_index([('imported_at', DESCENDING)])
         
-        logger.info("Unique indexes created successfully")
+        logger.info("Unique and time-window indexes created successfully")
     except Exception as e:
         logger.warning(f"Error creating unique indexes: {e}")
 
@@ -37,6 +68,42 @@ def setup_unique_indexes():
 
 # ===================== DATA TRANSFER FUNCTIONS =====================
 
+def _flush_bulk_ops(collection, bulk_ops, totals):
+    """Submit pending bulk ops, add the result counts to totals and clear the list in place."""
+    if not bulk_ops:
+        return
+    result = collection.bulk_write(bulk_ops, ordered=False)
+    totals['upserted'] += result.upserted_count
+    totals['modified'] += result.modified_count
+    totals['matched'] += result.matched_count
+    bulk_ops.clear()
+
+def _merge_pipeline(match, projection, target):
+    """Build a pipeline that copies matching documents into target by url without leaving the server."""
+    # Narrower than normalize_article_dates_for_database(): $dateFromString only reads the
+    # ISO-8601-style strings MongoDB's own parser accepts (no dateutil fallback, so e.g.
+    # '15/01/2024' stays a string) and unparseable values are kept as they are. No
+    # imported_at is added either; both callers already match on an imported_at window.
+    parse_dates = {
+        field: {'$cond': [
+            {'$eq': [{'$type': f'${field}'}, 'string']},
+            {'$dateFromString': {'dateString': f'${field}', 'onError': f'${field}'}},
+            f'${field}'
+        ]}
+        for field in DATE_FIELDS
+    }
+    return [
+        {'$match': match},
+        {'$project': projection},
+        {'$set': parse_dates},
+        {'$merge': {
+            'into': {'db': target.database.name, 'coll': target.name},
+            'on': 'url',
+            'whenMatched': 'merge',
+            'whenNotMatched': 'insert'
+        }}
+    ]
+
 def transfer_prediction_articles():
     """Transfer articles with prediction=1 from last 6 hours to analysis database"""
     print("\n" + "=" * 80)
@@ -90,28 +157,45 @@ def transfer_prediction_articles():
         'country': 1     
     }
 
-    articles = list(records_main.find(query, projection))
-    print(f"Found {len(articles)} articles with prediction=1")
+    # Articles that already carry locations and country need no Python-side
+    # enrichment, so they are copied server-side with $merge
+    enriched_query = dict(query, url={'$type': 'string'}, country={'$exists': True}, locations={'$exists': True})
+    merged_count = records_main.count_documents(enriched_query)
+    if merged_count:
+        try:
+            records_main.aggregate(_merge_pipeline(enriched_query, dict(projection, _id=0), records_analysis))
+            print(f"Merged {merged_count} already enriched articles server-side")
+        except Exception as e:
+            print(f"Error merging enriched articles: {e}")
+            merged_count = 0
+
+    if merged_count:
+        query['$nor'] = [{'country': {'$exists': True}, 'locations': {'$exists': True}}]
 
-    if not articles:
-        return 0
+    # Location lookups are slow per article, so keep cursor batches small enough
+    # to fetch the next batch well before the server's idle-cursor timeout
+    cursor = records_main.find(query, projection, batch_size=100)
+
+    # One processor for the whole transfer; its GeoNames rate limit spans every article
+    from location_extractor import UnifiedLocationProcessor
+    location_processor = UnifiedLocationProcessor(CONNECTION_STRING)
 
     bulk_ops = []
+    totals = dict.fromkeys(('upserted', 'modified', 'matched'), 0)
+    found_count = 0
     transferred_count = 0
 
-    for article in articles:
+    for article in cursor:
+        found_count += 1
         try:
             # Process article locations and countries
-            from processor import process_article_locations_and_countries
-            article = process_article_locations_and_countries(article)
+            article = process_article_locations_and_countries(article, location_processor)
 
-            # Remove _id and unwanted fields
-            article_copy = {k: v for k, v in article.items() if k not in {
-                '_id', 'title', 'summary', 'content', 'label',
-                'keywords', 'name', 'article', 'lastmod'
-            }}
+            # Remove _id and unwanted fields in place; the cursor document is not reused
+            for key in DROP_KEYS:
+                article.pop(key, None)
 
-            article_copy = normalize_article_dates_for_database(article_copy)
+            article_copy = normalize_article_dates_for_database(article)
 
             op = UpdateOne(
                 {'url': article['url']},
@@ -121,26 +205,37 @@ def transfer_prediction_articles():
             bulk_ops.append(op)
             transferred_count += 1
 
-            title = article.get('translated_title', 'Unknown')[:50]
-            locations_info = ""
-            if 'locations' in article_copy:
-                locs = article_copy['locations']
-                if isinstance(locs, list) and locs:
-                    locations_info += f" | Locations: {locs[:3]}"
-            if 'country' in article_copy:
-                locations_info += f" | Country: {article_copy['country']}"
-            print(f"Prepared: {title}...{locations_info}")
+            # Per-article detail only at DEBUG; stdout stays quiet inside the loop
+            if logger.isEnabledFor(logging.DEBUG):
+                title = article.get('translated_title', 'Unknown')[:50]
+                locations_info = ""
+                if 'locations' in article_copy:
+                    locs = article_copy['locations']
+                    if isinstance(locs, list) and locs:
+                        locations_info += f" | Locations: {locs[:3]}"
+                if 'country' in article_copy:
+                    locations_info += f" | Country: {article_copy['country']}"
+                logger.debug(f"Prepared: {title}...{locations_info}")
 
         except Exception as e:
             print(f"Error processing article: {e}")
 
-    if bulk_ops:
-        result = records_analysis.bulk_write(bulk_ops)
+        if len(bulk_ops) >= BULK_BATCH_SIZE:
+            _flush_bulk_ops(records_analysis, bulk_ops, totals)
+            print(f" Prepared {transferred_count} articles...")
+
+    print(f"Found {found_count + merged_count} articles with prediction=1")
+    if not found_count:
+        return merged_count
+
+    _flush_bulk_ops(records_analysis, bulk_ops, totals)
+    if transferred_count:
         print(f"\nBulk write completed:")
-        print(f"   - Upserted: {result.upserted_count}")
-        print(f"   - Modified: {result.modified_count}")
-        print(f"   - Matched: {result.matched_count}")
+        print(f"   - Upserted: {totals['upserted']}")
+        print(f"   - Modified: {totals['modified']}")
+        print(f"   - Matched: {totals['matched']}")
 
+    transferred_count += merged_count
     print(f"Total articles transferred from last 6 hours: {transferred_count}")
     print("=" * 80)
     return transferred_count
@@ -151,49 +246,28 @@ def transfer_eu_articles_to_final():
     records_analysis = collections['analysis']
     records_final = collections['final']
 
-    six_hours_ago = datetime.now(timezone.utc) - timedelta(hours=6)
     current_time = datetime.now(timezone.utc)
+    six_hours_ago = current_time - timedelta(hours=6)
 
     print(f"Looking for articles from: {six_hours_ago} to {current_time}")
 
-    # Get recent articles from source collection
-    analysis_articles = list(records_analysis.find({
-        'imported_at': {'$gte': six_hours_ago, '$lte': current_time}
-    }))
+    # Filtering and copying happen server-side, so no article leaves MongoDB
+    window = {'imported_at': {'$gte': six_hours_ago, '$lte': current_time}}
+    eu_query = dict(window, country={'$in': sorted(EU_COUNTRIES)}, url={'$type': 'string'})
 
-    print(f"Found {len(analysis_articles)} recent articles")
+    total_count = records_analysis.count_documents(window)
+    transferred_count = records_analysis.count_documents(eu_query)
+    skipped_count = total_count - transferred_count
 
-    transferred_count, skipped_count = 0, 0
+    print(f"Found {total_count} recent articles")
 
-    for article in analysis_articles:
+    if transferred_count:
         try:
-            country = article.get('country')
-
-            if not country:
-                print(f" Skipping article (no country): {article.get('url', 'Unknown')[:50]}...")
-                skipped_count += 1
-                continue
-
-            if is_eu_country(country):
-                article_copy = article.copy()
-                article_copy.pop('_id', None)
-                article_copy = normalize_article_dates_for_database(article_copy)
-                
-                records_final.update_one(
-                    {'url': article['url']},
-                    {'$set': article_copy},
-                    upsert=True
-                )
-                transferred_count += 1
-                print(f" Transferred EU article: {country} | {article.get('url', 'Unknown')[:50]}...")
-            else:
-                print(f" Skipping non-EU article: {country} | {article.get('url', 'Unknown')[:50]}...")
-                skipped_count += 1
-
+            records_analysis.aggregate(_merge_pipeline(eu_query, {'_id': 0}, records_final))
         except Exception as e:
-            print(f" Error processing article {article.get('url', 'Unknown')[:50]}: {e}")
-            skipped_count += 1
-            continue
+            print(f" Error merging EU articles into final collection: {e}")
+            skipped_count += transferred_count
+            transferred_count = 0
 
     print("\n Transfer Summary:")
     print(f" EU articles transferred: {transferred_count}")
@@ -205,8 +279,314 @@ def transfer_eu_articles_to_final():
 
 # ===================== EVENT PATTERN EXTRACTION =====================
 
-def extract_event_patterns_from_final_strikes():
-    """Extract event patterns and participant counts"""
+def _union(patterns):
+    """
+    Combine patterns into one case-insensitive alternation so each category is a single scan.
+    Compiled as a bytes pattern: the patterns are ASCII-only and article text is folded
+    to ASCII by _scan_bytes() and encoded once per scan.
+    """
+    return re.compile("|".join(f"(?:{p})" for p in patterns).encode('utf-8'), re.IGNORECASE)
+
+class _ScanFold(dict):
+    """
+    str.translate table folding each non-ASCII character to one ASCII stand-in of the
+    same regex class, so bytes patterns match exactly what the str patterns would:
+    Unicode whitespace (NBSP, ...) -> ' ', Unicode digits -> the ASCII digit, other word
+    characters -> 'x', anything else -> U+001A (SUB). One character stays one byte, so
+    .{0,30} still counts characters. Entries are filled in on first sight.
+    """
+
+    def __missing__(self, codepoint):
+        ch = chr(codepoint)
+        if codepoint < 128:
+            folded = codepoint
+        elif ch.isspace():
+            folded = ' '
+        elif ch.isdecimal():
+            folded = str(unicodedata.decimal(ch))
+        elif ch.isalnum():
+            folded = 'x'
+        else:
+            folded = '\x1a'
+        self[codepoint] = folded
+        return folded
+
+_SCAN_FOLD = _ScanFold()
+
+def _scan_bytes(text):
+    r"""
+    Return article text (str or UTF-8 bytes) as the ASCII bytes every event scan runs on,
+    Hyperscan and stdlib alike.
+
+    >>> _scan_bytes('shot\xa0dead')
+    b'shot dead'
+    >>> _scan_bytes('arrested \u201cafter\u201d police')
+    b'arrested \x1aafter\x1a police'
+    """
+    if isinstance(text, bytes):
+        text = text.decode('utf-8', errors='ignore')
+    if not text.isascii():
+        text = text.translate(_SCAN_FOLD)
+    return text.encode('ascii')
+
+# Protest context (use for sentence-level filtering)
+PROTEST_CONTEXT_PATTERN = (
+    r'\b('
+    r'protest|protests|protester|protesters|'
+    r'demonstration|demonstrations|demonstrator|demonstrators|'
+    r'rally|rallies|march|marches|picket|pickets|'
+    r'strike|strikes|striker|strikers|'
+    r'walkout|blockade|sit[-\s]?in|occupation|'
+    r'counter[-\s]?protest(?:ers)?'
+    r')\b')
+PROTEST_CONTEXT = _union([PROTEST_CONTEXT_PATTERN])
+
+# Negations / peaceful (if found in same sentence, lower score or reject)
+NEGATION_PATTERN = (
+    r'\b('
+    r'peaceful|peacefully|non[-\s]?violent|without\s+incident|'
+    r'no\s+violence|no\s+injur(?:y|ies)|no\s+arrests?'
+    r')\b')
+NEGATION = _union([NEGATION_PATTERN])
+
+# Strong violence indicators
+VIOLENT_STRONG_PATTERNS = [
+    r'\bshot\s+dead\b',
+    r'\bkilled\b',
+    r'\bfatal(?:ity|ities)?\b',
+    r'\bopened\s+fire\b',
+    r'\bfired\s+(?:live\s+)?rounds?\b',
+    r'\blive\s+ammunition\b',
+    r'\bgunfire\b',
+    r'\b(arson|torched|set\s+(?:on\s+)?fire|set\s+ablaze)\b',
+]
+
+# Medium violence indicators / conflicts / suppression / damage
+VIOLENT_MEDIUM_PATTERNS = [
+    r'(?<!non-)(?<!non\s)\b(violence|violent)\b',  # avoids "non-violent"
+    r'\battack(?:s|ed|ing)?\b',
+    r'\b(fight|fights|fighting)\b',
+    r'\bclash(?:es|ed|ing)?\b',
+    r'\bconfrontation(?:s)?\b',
+    r'\briot(?:s|ed|ing)?\b',
+    r'\bscuffle(?:s|d|ing)?\b',
+    r'\bskirmish(?:es)?\b',
+    r'\bbrawl(?:s|ed|ing)?\b',
+    r'\bmelee\b',
+    r'\b(injur(?:y|ies)|injured|wounded|hurt|casualt(?:y|ies)|hospitali[sz]ed)\b',
+    r'\b(tear[-\s]?gas|pepper[-\s]?spray|rubber[-\s]?bullets?|water[-\s]?cannons?)\b',
+    r'\b(stun\s+grenades?|flash[-\s]?bangs?)\b',
+    r'\b(baton|batons|truncheon(?:s)?)\b',
+    r'\b(looting|vandalism|property\s+damage)\b',
+]
+
+# Arrests with proximity to protesters/strikers (both orders)
+ARREST_PROXIMITY_PATTERNS = [
+    r'\b(arrest(?:s|ed|ing)?|detain(?:ed|ment|s)?)\b.{0,30}\b('
+    r'protester|protesters|demonstrator|demonstrators|striker|strikers|activist(?:s)?'
+    r')\b',
+    r'\b('
+    r'protester|protesters|demonstrator|demonstrators|striker|strikers|activist(?:s)?'
+    r')\b.{0,30}\b(arrest(?:s|ed|ing)?|detain(?:ed|ment|s)?)\b',
+]
+
+# Clashes with police/counter-protesters (both orders)
+CLASH_WITH_POLICE_PATTERNS = [
+    r'\b(clash(?:es|ed|ing)?|confrontation(?:s)?)\b.{0,30}\b('
+    r'police|riot\s+police|security\s+forces|counter[-\s]?protesters'
+    r')\b',
+    r'\b('
+    r'police|riot\s+police|security\s+forces|counter[-\s]?protesters'
+    r')\b.{0,30}\b(clash(?:es|ed|ing)?|confrontation(?:s)?)\b',
+]
+
+OCCUPATION_PATTERNS = [
+    r'\b(occupation|occupying|sit-in|sit-ins)\b',
+    r'\b(school\s+occupation|university\s+occupation)\b',
+    r'\b(building\s+occupation|office\s+occupation)\b',
+    r'\b(students?\s+occupying|workers?\s+occupying)\b',
+    r'\b(protesters?\s+occupying|activists?\s+occupying)\b',
+    r'\b(occupy\s+(?:the|a|an)\s+\w+)\b',
+    r'\b(occupation\s+of\s+\w+)\b',
+    r'\b(sit-in\s+protest|sit-in\s+demonstration)\b',
+]
+
+# One precompiled alternation per category: a single pass over the text each
+STRONG_UNION = _union(VIOLENT_STRONG_PATTERNS)
+MEDIUM_UNION = _union(VIOLENT_MEDIUM_PATTERNS)
+ARREST_UNION = _union(ARREST_PROXIMITY_PATTERNS)
+CLASH_UNION = _union(CLASH_WITH_POLICE_PATTERNS)
+OCCUPATION_UNION = _union(OCCUPATION_PATTERNS)
+PARTICIPANT_CUE = _union([PARTICIPANT_CUE_PATTERN])
+
+EVENT_CATEGORY_PATTERNS = {
+    'context': [PROTEST_CONTEXT_PATTERN],
+    'negation': [NEGATION_PATTERN],
+    'strong': VIOLENT_STRONG_PATTERNS,
+    'medium': VIOLENT_MEDIUM_PATTERNS,
+    'arrest': ARREST_PROXIMITY_PATTERNS,
+    'clash': CLASH_WITH_POLICE_PATTERNS,
+    'occupation': OCCUPATION_PATTERNS,
+    'participants': [PARTICIPANT_CUE_PATTERN],
+}
+
+_HS_STATE = None
+
+def _get_hyperscan_db():
+    """
+    Compile every event pattern into one Hyperscan block-mode database (once per process).
+    Patterns Hyperscan cannot express (lookbehind) are returned as stdlib residuals.
+    Returns (db, category_by_id, residual_unions) or None when hyperscan is unavailable.
+    """
+    global _HS_STATE
+    if hyperscan is None:
+        return None
+    if _HS_STATE is None:
+        expressions, category_by_id, residual = [], [], {}
+        for category, patterns in EVENT_CATEGORY_PATTERNS.items():
+            for p in patterns:
+                if '(?<' in p:
+                    residual.setdefault(category, []).append(p)
+                    continue
+                expressions.append(p.encode('utf-8'))
+                category_by_id.append(category)
+        # Input is already folded to ASCII by _scan_bytes(), so no HS_FLAG_UTF8/UCP: '.' and
+        # \s then behave exactly as in the stdlib bytes patterns (and UCP rejects \b anyway)
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(expressions=expressions, ids=list(range(len(expressions))),
+                   elements=len(expressions), flags=[flags] * len(expressions))
+        _HS_STATE = (db, category_by_id, {c: _union(ps) for c, ps in residual.items()})
+    return _HS_STATE
+
+def _scan_event_categories(article_text):
+    """
+    Return the set of EVENT_CATEGORY_PATTERNS categories matching the text, from a
+    single Hyperscan pass plus any residual patterns; None when hyperscan is unavailable.
+    """
+    hs_state = _get_hyperscan_db()
+    if hs_state is None:
+        return None
+    db, category_by_id, residual = hs_state
+    text_b = _scan_bytes(article_text)
+    found = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        found.add(category_by_id[pattern_id])
+
+    db.scan(text_b, match_event_handler=on_match)
+    for category, rx in residual.items():
+        if category not in found and rx.search(text_b):
+            found.add(category)
+    return found
+
+def _classify_categories(found):
+    """Turn matched categories into (has_violent, has_occupation)."""
+    has_violent = ('context' in found and 'negation' not in found and
+                   bool(found & {'strong', 'medium', 'arrest', 'clash'}))
+    return has_violent, 'occupation' in found
+
+def classify_event_text(article_text):
+    """Return (has_violent, has_occupation) for an article body (str or UTF-8 bytes)."""
+    text_b = _scan_bytes(article_text)
+    found = _scan_event_categories(text_b)
+    if found is not None:
+        return _classify_categories(found)
+
+    has_violent = False
+    # Violent scans only matter inside a protest context, so check that first
+    if PROTEST_CONTEXT.search(text_b):
+        # Check for negation (peaceful indicators)
+        if NEGATION.search(text_b):
+            has_violent = False
+        else:
+            # Strong, medium, arrest-proximity and police-clash indicators
+            has_violent = (
+                STRONG_UNION.search(text_b) is not None
+                or MEDIUM_UNION.search(text_b) is not None
+                or ARREST_UNION.search(text_b) is not None
+                or CLASH_UNION.search(text_b) is not None
+            )
+
+    # Every occupation pattern contains 'occup' or 'sit-in'; skip the regex without either
+    lowered = text_b.lower()
+    has_occupation = (
+        (b'occup' in lowered or b'sit-in' in lowered)
+        and OCCUPATION_UNION.search(text_b) is not None
+    )
+    return has_violent, has_occupation
+
+def _scan_article(text):
+    """Classify one article text and count participants; runs in a worker process."""
+    try:
+        text_b = _scan_bytes(text)
+        found = _scan_event_categories(text_b)
+        if found is not None:
+            # The participant cue came out of the same pass as the event patterns
+            has_violent, has_occupation = _classify_categories(found)
+            has_counts = 'participants' in found
+        else:
+            has_violent, has_occupation = classify_event_text(text_b)
+            has_counts = PARTICIPANT_CUE.search(text_b) is not None
+
+        participant_counts = extract_participant_count(text) if has_counts else dict(NO_PARTICIPANT_COUNTS)
+        return has_violent, has_occupation, participant_counts
+    except Exception as e:
+        return e
+
+def _flush_event_updates(collection, pending, totals):
+    """Write one update per distinct event payload, covering every article that shares it."""
+    bulk_ops = []
+    for (has_violent, has_occupation, count_items), ids in pending.items():
+        update_data = {
+            'has_violent_events': has_violent,
+            'occupation_info': has_occupation,
+            'participant_counts': dict(count_items)
+        }
+        if len(ids) == 1:
+            bulk_ops.append(UpdateOne({'_id': ids[0]}, {'$set': update_data}))
+        else:
+            bulk_ops.append(UpdateMany({'_id': {'$in': ids}}, {'$set': update_data}))
+    _flush_bulk_ops(collection, bulk_ops, totals)
+    pending.clear()
+
+def _extraction_window_end(window_end, sharded):
+    """
+    Resolve the end of the extraction window. Shards must agree on it, so when sharded
+    without an explicit end, now is floored to the hour for runs started in the same hour.
+    """
+    if window_end is None:
+        now = datetime.now(timezone.utc)
+        return now.replace(minute=0, second=0, microsecond=0) if sharded else now
+    if isinstance(window_end, str):
+        window_end = datetime.fromisoformat(window_end.replace('Z', '+00:00'))
+    return window_end if window_end.tzinfo else window_end.replace(tzinfo=timezone.utc)
+
+def _shard_id_range(window_start, window_end, shard_index, shard_count):
+    """
+    Return an _id range filter selecting the shard_index-th of shard_count contiguous
+    ObjectId-time slices of [window_start, window_end], or {} when unsharded.
+    The outer slices are open-ended, so every _id falls in exactly one shard; the
+    boundaries depend only on the window, never on what is in the collection.
+    """
+    if shard_count <= 1:
+        return {}
+    step = (window_end - window_start) / shard_count
+    id_range = {}
+    if shard_index > 0:
+        id_range['$gte'] = ObjectId.from_datetime(window_start + step * shard_index)
+    if shard_index < shard_count - 1:
+        id_range['$lt'] = ObjectId.from_datetime(window_start + step * (shard_index + 1))
+    return {'_id': id_range}
+
+def extract_event_patterns_from_final_strikes(shard_index=EXTRACT_SHARD_INDEX, shard_count=EXTRACT_SHARD_COUNT,
+                                              window_end=EXTRACT_WINDOW_END):
+    """
+    Extract event patterns and participant counts.
+    With shard_count > 1 only the shard_index-th _id range of the window is processed,
+    so several runs can split a large backfill and write independently; all shards of
+    one run must be given the same window_end.
+    """
     try:
         print("\n" + "="*80)
         print("EXTRACTING EVENT PATTERNS AND PARTICIPANT COUNTS FROM FINAL DATABASE")
@@ -214,180 +594,88 @@ def extract_event_patterns_from_final_strikes():
 
         client, databases, collections = get_database_connections()
         records_final = collections['final']
+        # Articles are only read here, so keep them as raw BSON instead of building dicts
+        raw_final = records_final.with_options(
+            codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
 
-        now = datetime.now(timezone.utc)
+        now = _extraction_window_end(window_end, shard_count > 1)
         six_hours_ago = now - timedelta(hours=6)
         print(f"Looking for articles from: {six_hours_ago} to {now}")
 
-        articles_without_patterns = list(records_final.find({
-            'imported_at': {'$gte': six_hours_ago, '$lte': now}
-        }, {'_id': 1, 'url': 1, 'text': 1, 'article': 1}))
-        
-        print(f"Found {len(articles_without_patterns)} articles without event patterns or participant counts")
-        
-        if not articles_without_patterns:
-            print(" All articles already have event patterns and participant counts")
-            return 0
-        
-        articles = articles_without_patterns
+        query = {
+            'imported_at': {'$gte': six_hours_ago, '$lte': now},
+            'text': {'$type': 'string', '$ne': ''}
+        }
+        if shard_count > 1:
+            print(f"Processing shard {shard_index + 1} of {shard_count}")
+            query.update(_shard_id_range(six_hours_ago, now, shard_index, shard_count))
 
-        updated_count = 0
-        bulk_ops = []
+        articles = raw_final.find(query, {'_id': 1, 'url': 1, 'text': 1}, batch_size=BULK_BATCH_SIZE)
 
-        # Precompile patterns
-        import re
-        
-        # 1) Protest context (use for sentence-level filtering)
-        PROTEST_CONTEXT = re.compile(
-            r'\b('
-            r'protest|protests|protester|protesters|'
-            r'demonstration|demonstrations|demonstrator|demonstrators|'
-            r'rally|rallies|march|marches|picket|pickets|'
-            r'strike|strikes|striker|strikers|'
-            r'walkout|blockade|sit[-\s]?in|occupation|'
-            r'counter[-\s]?protest(?:ers)?'
-            r')\b', re.IGNORECASE)
-
-        # 2) Negations / peaceful (if found in same sentence, lower score or reject)
-        NEGATION = re.compile(
-            r'\b('
-            r'peaceful|peacefully|non[-\s]?violent|without\s+incident|'
-            r'no\s+violence|no\s+injur(?:y|ies)|no\s+arrests?'
-            r')\b', re.IGNORECASE)
-
-        # 3) Strong violence indicators
-        VIOLENT_STRONG = [re.compile(p, re.IGNORECASE) for p in [
-            r'\bshot\s+dead\b',
-            r'\bkilled\b',
-            r'\bfatal(?:ity|ities)?\b',
-            r'\bopened\s+fire\b',
-            r'\bfired\s+(?:live\s+)?rounds?\b',
-            r'\blive\s+ammunition\b',
-            r'\bgunfire\b',
-            r'\b(arson|torched|set\s+(?:on\s+)?fire|set\s+ablaze)\b',
-        ]]
-
-        # 4) Medium violence indicators / conflicts / suppression / damage
-        VIOLENT_MEDIUM = [re.compile(p, re.IGNORECASE) for p in [
-            r'(?<!non[-\s]?)\b(violence|violent)\b',  # avoids "non-violent"
-            r'\battack(?:s|ed|ing)?\b',
-            r'\b(fight|fights|fighting)\b',
-            r'\bclash(?:es|ed|ing)?\b',
-            r'\bconfrontation(?:s)?\b',
-            r'\briot(?:s|ed|ing)?\b',
-            r'\bscuffle(?:s|d|ing)?\b',
-            r'\bskirmish(?:es)?\b',
-            r'\bbrawl(?:s|ed|ing)?\b',
-            r'\bmelee\b',
-            r'\b(injur(?:y|ies)|injured|wounded|hurt|casualt(?:y|ies)|hospitali[sz]ed)\b',
-            r'\b(tear[-\s]?gas|pepper[-\s]?spray|rubber[-\s]?bullets?|water[-\s]?cannons?)\b',
-            r'\b(stun\s+grenades?|flash[-\s]?bangs?)\b',
-            r'\b(baton|batons|truncheon(?:s)?)\b',
-            r'\b(looting|vandalism|property\s+damage)\b',
-        ]]
-
-        # 5) Arrests with proximity to protesters/strikers (both orders)
-        ARREST_PROXIMITY = [
-            re.compile(r'\b(arrest(?:s|ed|ing)?|detain(?:ed|ment|s)?)\b.{0,30}\b('
-                       r'protester|protesters|demonstrator|demonstrators|striker|strikers|activist(?:s)?'
-                       r')\b', re.IGNORECASE),
-            re.compile(r'\b('
-                       r'protester|protesters|demonstrator|demonstrators|striker|strikers|activist(?:s)?'
-                       r')\b.{0,30}\b(arrest(?:s|ed|ing)?|detain(?:ed|ment|s)?)\b', re.IGNORECASE),
-        ]
-
-        # 6) Clashes with police/counter-protesters (both orders)
-        CLASH_WITH_POLICE = [
-            re.compile(r'\b(clash(?:es|ed|ing)?|confrontation(?:s)?)\b.{0,30}\b('
-                       r'police|riot\s+police|security\s+forces|counter[-\s]?protesters'
-                       r')\b', re.IGNORECASE),
-            re.compile(r'\b('
-                       r'police|riot\s+police|security\s+forces|counter[-\s]?protesters'
-                       r')\b.{0,30}\b(clash(?:es|ed|ing)?|confrontation(?:s)?)\b', re.IGNORECASE),
-        ]
-        occupation_patterns = [
-            re.compile(p, re.IGNORECASE) for p in [
-                r'\b(occupation|occupying|sit-in|sit-ins)\b',
-                r'\b(school\s+occupation|university\s+occupation)\b',
-                r'\b(building\s+occupation|office\s+occupation)\b',
-                r'\b(students?\s+occupying|workers?\s+occupying)\b',
-                r'\b(protesters?\s+occupying|activists?\s+occupying)\b',
-                r'\b(occupy\s+(?:the|a|an)\s+\w+)\b',
-                r'\b(occupation\s+of\s+\w+)\b',
-                r'\b(sit-in\s+protest|sit-in\s+demonstration)\b'
-            ]
-        ]
-
-        for article in articles:
-            try:
-                article_text = str(article.get('text')).strip()
-                if not article_text:
+        found_count = 0
+        updated_count = 0
+        # Most articles share the same payload (peaceful, no occupation, no counts),
+        # so ids are grouped by payload and written with one update per group
+        pending = defaultdict(list)
+        totals = dict.fromkeys(('upserted', 'modified', 'matched'), 0)
+        batch = []
+
+        def scan_batch(executor):
+            """Scan the buffered articles in the worker pool, then write their results."""
+            nonlocal updated_count
+            texts = [text for _, _, text in batch]
+            for (article_id, url, _), result in zip(batch, executor.map(_scan_article, texts, chunksize=50)):
+                if isinstance(result, Exception):
+                    print(f" Error processing article {url[:50]}: {result}")
                     continue
 
-               
-                has_violent = False
-                has_occupation = any(p.search(article_text) for p in occupation_patterns)
-                
-                # Check for protest context first
-                if PROTEST_CONTEXT.search(article_text):
-                    # Check for negation (peaceful indicators)
-                    if NEGATION.search(article_text):
-                        has_violent = False
-                    else:
-                        # Check for strong violent indicators
-                        if any(p.search(article_text) for p in VIOLENT_STRONG):
-                            has_violent = True
-                        # Check for medium violent indicators
-                        elif any(p.search(article_text) for p in VIOLENT_MEDIUM):
-                            has_violent = True
-                        # Check for arrest proximity
-                        elif any(p.search(article_text) for p in ARREST_PROXIMITY):
-                            has_violent = True
-                        # Check for clashes with police
-                        elif any(p.search(article_text) for p in CLASH_WITH_POLICE):
-                            has_violent = True
-                
-                status = "violent" if has_violent else "peaceful"
-
-                # Extract participant counts using the extract_participant_count function
-                from utils import extract_participant_count
-                participant_counts = extract_participant_count(article_text)
-
-                update_data = {
-                    'has_violent_events': has_violent,
-                    'occupation_info': has_occupation,
-                    'participant_counts': participant_counts
-                }
-
-                bulk_ops.append(
-                    UpdateOne({'_id': article['_id']}, {'$set': update_data})
-                )
+                has_violent, has_occupation, participant_counts = result
+                payload_key = (has_violent, has_occupation, tuple(participant_counts.items()))
+                pending[payload_key].append(article_id)
                 updated_count += 1
 
-                # Show progress with participant count info
                 if participant_counts['max_count'] > 0:
-                    print(f" Found {participant_counts['max_count']} participants in article {updated_count}")
+                    logger.debug(f"Found {participant_counts['max_count']} participants in article {updated_count}")
+
+            batch.clear()
+            _flush_event_updates(records_final, pending, totals)
+            print(f" Processed {updated_count} articles...")
+
+        # Regex scanning is CPU-bound, so it runs in a process pool while the
+        # cursor reads and the bulk writes stay on this process
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for article in articles:
+                found_count += 1
+                article_text = (article.get('text') or '').strip()
+                if not article_text:
+                    continue
+                batch.append((article['_id'], article.get('url', 'Unknown'), article_text))
 
-                if updated_count % 50 == 0:
-                    print(f" Processed {updated_count} articles...")
+                if len(batch) >= BULK_BATCH_SIZE:
+                    scan_batch(executor)
 
-            except Exception as e:
-                print(f" Error processing article {article.get('url', 'Unknown')[:50]}: {e}")
+            if batch:
+                scan_batch(executor)
 
-        # Commit all updates
-        if bulk_ops:
-            result = records_final.bulk_write(bulk_ops)
-            print(f"\n Bulk write completed: {result.modified_count} modified")
+        print(f"Found {found_count} articles without event patterns or participant counts")
+        if not found_count:
+            print(" All articles already have event patterns and participant counts")
+            return 0
 
-        # Stats
-        violent = records_final.count_documents({'has_violent_events': True})
-        occupation = records_final.count_documents({'occupation_info': True})
-        
-        # Participant count stats
-        articles_with_participants = records_final.count_documents({
-            'participant_counts.max_count': {'$gt': 0}
-        })
-        total_articles = records_final.count_documents({})
+        if updated_count:
+            print(f"\n Bulk write completed: {totals['modified']} modified")
+
+        # Stats, all counted in one aggregation round trip
+        facets = next(records_final.aggregate([{'$facet': {
+            'violent': [{'$match': {'has_violent_events': True}}, {'$count': 'n'}],
+            'occupation': [{'$match': {'occupation_info': True}}, {'$count': 'n'}],
+            'with_participants': [{'$match': {'participant_counts.max_count': {'$gt': 0}}}, {'$count': 'n'}],
+        }}]), {})
+        violent, occupation, articles_with_participants = (
+            facets[name][0]['n'] if facets.get(name) else 0
+            for name in ('violent', 'occupation', 'with_participants')
+        )
 
         print(f"\n Event Pattern Stats:")
         print(f" Violent events: {violent}")
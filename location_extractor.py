@@ -3,15 +3,29 @@ Unified Location Processor for the European Strikes News Extraction System.
 Handles location extraction, geocoding, and country identification.
 """
 
+import atexit
 import spacy
 import logging
 import re
 import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timezone
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import time
 from urllib.parse import urlparse
 
+from utils import get_punkt
+
+try:
+    import pycountry  # optional: local country-name resolution
+except ImportError:
+    pycountry = None
+
 # Disable HTTP request logging from requests library
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("requests").setLevel(logging.WARNING)
@@ -21,128 +35,291 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-nlp = spacy.load("en_core_web_sm")
+# Persistent GeoNames cache; "no such place" answers are re-checked after the TTL
+GEOCODE_CACHE_PATH = os.environ.get("GEOCODE_CACHE_PATH", "geocache.db")
+GEOCODE_NEGATIVE_TTL = 30 * 24 * 3600
+
+# URL to country mapping based on corpus.py URLs
+_URL_COUNTRY = {
+    # Malta
+    'timesofmalta.com': 'Malta',
+    
+    # Poland
+    'rp.pl': 'Poland',
+    
+    # Finland
+    'hs.fi': 'Finland',
+    
+    # Croatia
+    '24sata.hr': 'Croatia',
+    
+    # Denmark
+    'bt.dk': 'Denmark',
+    
+    # Estonia
+    'delfi.ee': 'Estonia',
+    'postimees.ee': 'Estonia',
+    
+    # Bulgaria
+    'standartnews.com': 'Bulgaria',
+    
+    # Belgium
+    'lalibre.be': 'Belgium',
+    
+    # Netherlands
+    'volkskrant.nl': 'Netherlands',
+    
+    # Lithuania
+    've.lt': 'Lithuania',
+    
+    # Czech Republic
+    'blesk.cz': 'Czech Republic',
+    
+    # Romania
+    'realitatea.net': 'Romania',
+    
+    # Luxembourg
+    'lessentiel.lu': 'Luxembourg',
+    
+    # Germany
+    'welt.de': 'Germany',
+    
+    # Austria
+    'krone.at': 'Austria',
+    
+    # Greece
+    'tanea.gr': 'Greece',
+    
+    # Italy
+    'repubblica.it': 'Italy',
+    
+    # France
+    'lemonde.fr': 'France',
+    
+    # Portugal
+    'publico.pt': 'Portugal',
+    
+    # Spain
+    'elpais.com': 'Spain',
+    
+    # Ireland
+    'irishtimes.com': 'Ireland',
+    
+    # Hungary
+    'nepszava.hu': 'Hungary',
+    
+    # Slovakia
+    'sme.sk': 'Slovakia',
+    
+    # Sweden
+    'gp.se': 'Sweden',
+    
+    # Cyprus
+    'politis.com.cy': 'Cyprus',
+    'philenews.com': 'Cyprus',
+    
+    # Latvia
+    'diena.lv': 'Latvia'
+}
+
+def _build_country_names():
+    """Map lowercased country names (and upper-case ISO alpha-2 codes) to a display name."""
+    names = {}
+    if pycountry is None:
+        return names
+    for c in pycountry.countries:
+        display = getattr(c, 'common_name', c.name)
+        for name in (c.name, getattr(c, 'common_name', None), getattr(c, 'official_name', None)):
+            if name:
+                names[name.lower()] = display
+        # Codes only when written in capitals, so words like "it" or "no" never match
+        names[c.alpha_2] = display
+    return names
+
+# Locations that are themselves country names resolve without a GeoNames request
+_COUNTRY_NAMES = _build_country_names()
+
+# Concurrent GeoNames lookups per processor, kept low for the free tier
+GEONAMES_MAX_WORKERS = 4
+# Client-side GeoNames request rate (requests per second, burst size)
+GEONAMES_RATE = 4
+
+# Only the NER component is used (GPE/LOC entities); sentences are split by NLTK
+nlp = spacy.load("en_core_web_sm", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+
+# Protest keywords (from corpus.py)
+PROTEST_KEYWORDS = (
+    'protest', 'demonstration', 'rally', 'boycott', 'strike', 'walkout', 
+    'stoppage', 'workstop', 'gather', 'mobilize', 'march', 'picket',
+    'occupation', 'riot', 'blockade', 'activism', 'activist'
+)
+
+@lru_cache(maxsize=8)
+def _keyword_regex(keywords):
+    """Compile a keyword tuple into one alternation matching any keyword as a substring."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+class TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# GeoNames plumbing shared by every processor instance: the rate limit, keep-alive
+# connections and caches must span articles rather than restart with each processor
+_GEONAMES_BUCKET = TokenBucket(rate=GEONAMES_RATE, capacity=GEONAMES_RATE)
+_GEONAMES_POOL = ThreadPoolExecutor(max_workers=GEONAMES_MAX_WORKERS)
+_GEOCODING_CACHE = {}
+_GEOCACHE_LOCK = threading.Lock()
+_GEOCACHE = None
+_SESSION = None
+_SHARED_LOCK = threading.Lock()
+
+def _get_geocache():
+    """Open the on-disk GeoNames cache on first use; one connection per process."""
+    global _GEOCACHE
+    with _SHARED_LOCK:
+        if _GEOCACHE is None:
+            conn = sqlite3.connect(GEOCODE_CACHE_PATH, check_same_thread=False)
+            with _GEOCACHE_LOCK:
+                conn.execute("CREATE TABLE IF NOT EXISTS geo(loc TEXT PRIMARY KEY, country TEXT, ts INTEGER)")
+                conn.commit()
+            _GEOCACHE = conn
+        return _GEOCACHE
+
+def _get_session():
+    """Build the keep-alive GeoNames session on first use, with enough connections for every lookup thread."""
+    global _SESSION
+    with _SHARED_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = "European-Strikes-News-Extraction/1.0"
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+@atexit.register
+def close_shared_resources():
+    """Stop the lookup threads and close the shared session and cache connection."""
+    global _GEOCACHE, _SESSION
+    _GEONAMES_POOL.shutdown(wait=False, cancel_futures=True)
+    with _SHARED_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+        if _GEOCACHE is not None:
+            with _GEOCACHE_LOCK:
+                _GEOCACHE.close()
+            _GEOCACHE = None
+
 
 class UnifiedLocationProcessor:
     def __init__(self, connection_string=None):
         """Initialize the location processor without database dependencies."""
-        self.geocoding_cache = {}
+        self.geocoding_cache = _GEOCODING_CACHE
         self.geonames_username = os.environ.get("GEONAMES_USERNAME")
         if not self.geonames_username:
             raise ValueError("GEONAMES_USERNAME environment variable is required. Please set it in your .env file or environment.")  
+        
+        # Process-wide singletons, so building several processors neither resets
+        # the rate limit nor opens another connection, pool or session
+        self._geocache_lock = _GEOCACHE_LOCK
+        self.geocache = _get_geocache()
+        self._geonames_pool = _GEONAMES_POOL
+        self._geonames_bucket = _GEONAMES_BUCKET
+        self.session = _get_session()
+
+    def _first_country(self, locations):
+        """
+        Look up distinct locations concurrently and return (country, location) for the
+        first one in list order that resolves, or (None, None). Lookups not yet started
+        are cancelled once an earlier location has resolved.
+        """
+        unique_locs = [loc for loc in dict.fromkeys(locations) if loc]
+        futures = [(loc, self._geonames_pool.submit(self.get_country_from_geonames, loc, self.geonames_username))
+                   for loc in unique_locs]
+        try:
+            for loc, future in futures:
+                country = future.result()
+                if country:
+                    return country, loc
+            return None, None
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def get_country_from_locations(self, locations):
+        """Return (country, location) for the first location, in list order, that resolves to a country."""
+        return self._first_country(locations)
+
+    def _read_geocache(self, key):
+        """Return (hit, country) from the persistent cache; expired negative entries count as misses."""
+        with self._geocache_lock:
+            row = self.geocache.execute("SELECT country, ts FROM geo WHERE loc=?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        country, ts = row
+        if country is None and time.time() - ts > GEOCODE_NEGATIVE_TTL:
+            return False, None
+        return True, country
+
+    def _write_geocache(self, key, country):
+        """Store a definitive GeoNames answer (including no result) in the persistent cache."""
+        with self._geocache_lock:
+            self.geocache.execute("INSERT OR REPLACE INTO geo(loc, country, ts) VALUES (?, ?, ?)",
+                                  (key, country, int(time.time())))
+            self.geocache.commit()
 
     def extract_locations_from_text(self, text):
         """Extract location entities from text using spaCy."""
         if not text:
             return []
+        return self.extract_locations_from_texts([text])[0]
+
+    def extract_locations_from_texts(self, texts, batch_size=32):
+        """Extract location entities from several texts in one batched spaCy pass (one list per text)."""
         try:
-            doc = nlp(text)
-            return list(set([ent.text.strip() for ent in doc.ents if ent.label_ in ["GPE", "LOC"]]))
+            return [
+                list(set([ent.text.strip() for ent in doc.ents if ent.label_ in ["GPE", "LOC"]]))
+                for doc in nlp.pipe((text or "" for text in texts), batch_size=batch_size)
+            ]
         except Exception as e:
             logger.error(f"Error extracting locations from text: {e}")
-            return []
+            return [[] for _ in texts]
 
     def get_country_from_url(self, url):
         """Extract country from URL based on domain patterns."""
         if not url:
             return None
-            
-        # URL to country mapping based on corpus.py URLs
-        url_country_mapping = {
-            # Malta
-            'timesofmalta.com': 'Malta',
-            
-            # Poland
-            'rp.pl': 'Poland',
-            
-            # Finland
-            'hs.fi': 'Finland',
-            
-            # Croatia
-            '24sata.hr': 'Croatia',
-            
-            # Denmark
-            'bt.dk': 'Denmark',
-            
-            # Estonia
-            'delfi.ee': 'Estonia',
-            'postimees.ee': 'Estonia',
-            
-            # Bulgaria
-            'standartnews.com': 'Bulgaria',
-            
-            # Belgium
-            'lalibre.be': 'Belgium',
-            
-            # Netherlands
-            'volkskrant.nl': 'Netherlands',
-            
-            # Lithuania
-            've.lt': 'Lithuania',
-            
-            # Czech Republic
-            'blesk.cz': 'Czech Republic',
-            
-            # Romania
-            'realitatea.net': 'Romania',
-            
-            # Luxembourg
-            'lessentiel.lu': 'Luxembourg',
-            
-            # Germany
-            'welt.de': 'Germany',
-            
-            # Austria
-            'krone.at': 'Austria',
-            
-            # Greece
-            'tanea.gr': 'Greece',
-            
-            # Italy
-            'repubblica.it': 'Italy',
-            
-            # France
-            'lemonde.fr': 'France',
-            
-            # Portugal
-            'publico.pt': 'Portugal',
-            
-            # Spain
-            'elpais.com': 'Spain',
-            
-            # Ireland
-            'irishtimes.com': 'Ireland',
-            
-            # Hungary
-            'nepszava.hu': 'Hungary',
-            
-            # Slovakia
-            'sme.sk': 'Slovakia',
-            
-            # Sweden
-            'gp.se': 'Sweden',
-            
-            # Cyprus
-            'politis.com.cy': 'Cyprus',
-            'philenews.com': 'Cyprus',
-            
-            # Latvia
-            'diena.lv': 'Latvia'
-        }
         
         try:
             # Extract domain from URL
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.lower()
-            
-            # Check for exact domain match
-            if domain in url_country_mapping:
-                country = url_country_mapping[domain]
-                return country
+            domain = (urlparse(url).hostname or "").removeprefix("www.")
             
-            # Check for partial domain match (for subdomains)
-            for url_pattern, country in url_country_mapping.items():
-                if url_pattern in domain:
+            # Exact domain first, then each parent domain (covers subdomains)
+            parts = domain.split(".")
+            for label_cut in range(len(parts) - 1):
+                country = _URL_COUNTRY.get(".".join(parts[label_cut:]))
+                if country:
                     return country
             
             return None
@@ -154,24 +331,41 @@ class UnifiedLocationProcessor:
         """Get country name from location using GeoNames API with exponential backoff and caching."""
         if username is None:
             username = self.geonames_username
-        url = f"http://api.geonames.org/searchJSON?q={location}&maxRows=1&username={username}"
+        key = location.strip().lower()
+        local_country = _COUNTRY_NAMES.get(key) or _COUNTRY_NAMES.get(location.strip())
+        if local_country:
+            return local_country
         
-        # Check memory cache first
-        if location in self.geocoding_cache:
-            return self.geocoding_cache[location]
+        # Check memory cache first, then the persistent cache
+        if key in self.geocoding_cache:
+            return self.geocoding_cache[key]
+        hit, country_name = self._read_geocache(key)
+        if hit:
+            self.geocoding_cache[key] = country_name
+            return country_name
         
         # Exponential backoff retry logic
         for attempt in range(max_retries):
             try:             
-                response = requests.get(url, timeout=10) 
+                self._geonames_bucket.acquire()
+                response = self.session.get(
+                    "https://api.geonames.org/searchJSON",
+                    params={"q": location, "maxRows": 1, "username": username},
+                    timeout=10
+                )
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     if data['totalResultsCount'] > 0:
                         country_name = data['geonames'][0].get('countryName')
-                        self.geocoding_cache[location] = country_name
+                        self.geocoding_cache[key] = country_name
+                        self._write_geocache(key, country_name)
                             
                         logger.info(f"Found country for {location} (GeoNames API): {country_name}")
                         return country_name
+                    # GeoNames knows no such place: a definitive miss, no point retrying
+                    self.geocoding_cache[key] = None
+                    self._write_geocache(key, None)
+                    return None
                 elif response.status_code == 429:  # Rate limit exceeded
                     logger.warning(f"GeoNames API rate limit exceeded for {location}")
                     if attempt < max_retries - 1:
@@ -204,7 +398,7 @@ class UnifiedLocationProcessor:
                 else:
                     return None
         
-        self.geocoding_cache[location] = None
+        self.geocoding_cache[key] = None
         
         logger.warning(f"All retries failed for {location}")
         geo_logger.warning(f"GeoNames failed for location: {location} (after {max_retries} attempts)")
@@ -218,36 +412,29 @@ class UnifiedLocationProcessor:
         Find country based on proximity to protest keywords.
         Hierarchical approach: same sentence > adjacent sentences > top-K global locations
         """
-        import nltk
-        from nltk.tokenize import sent_tokenize
+        sentences = get_punkt().tokenize(text)
         
-        sentences = sent_tokenize(text)
-        
-        # Find sentences with keywords (text is already lowercase)
-        keyword_sentences = []
-        for i, sentence in enumerate(sentences):
-            for keyword in keywords:
-                if keyword in sentence:
-                    keyword_sentences.append((i, sentence))
-                    break
+        # Find sentences with keywords: one scan per sentence for all keywords
+        keyword_re = _keyword_regex(tuple(keywords))
+        keyword_sentences = [(i, sentence) for i, sentence in enumerate(sentences) if keyword_re.search(sentence)]
         
         if not keyword_sentences:
             return None, []
         
+        # Run NER once over all sentences; every strategy below reuses these results
+        sentence_locations = self.extract_locations_from_texts(sentences)
+        
         # Strategy 1: Check same sentence as keywords
         same_sentence_locations = []
         for sent_idx, sentence in keyword_sentences:
-            sentence_locations = self.extract_locations_from_text(sentence)
-            same_sentence_locations.extend(sentence_locations)
+            same_sentence_locations.extend(sentence_locations[sent_idx])
         
         if same_sentence_locations:
             logger.info(f"🔍 Checking {len(same_sentence_locations)} locations in same sentence as keywords")
-            for loc in same_sentence_locations:
-                if loc:
-                    country = self.get_country_from_geonames(loc, self.geonames_username)
-                    if country:
-                        logger.info(f"✅ Found country '{country}' from location '{loc}' in same sentence as keyword")
-                        return country, [loc]
+            country, loc = self._first_country(same_sentence_locations)
+            if country:
+                logger.info(f"✅ Found country '{country}' from location '{loc}' in same sentence as keyword")
+                return country, [loc]
         
         # Strategy 2: Check adjacent sentences (±1, ±2)
         adjacent_locations = []
@@ -255,21 +442,17 @@ class UnifiedLocationProcessor:
             for offset in [-1, 1]:
                 check_idx = sent_idx + offset
                 if 0 <= check_idx < len(sentences):
-                    adj_sentence = sentences[check_idx]
-                    adj_locations = self.extract_locations_from_text(adj_sentence)
-                    adjacent_locations.extend(adj_locations)
+                    adjacent_locations.extend(sentence_locations[check_idx])
         
         if adjacent_locations:
             logger.info(f"🔍 Checking {len(adjacent_locations)} locations in adjacent sentences to keywords")
-            for loc in adjacent_locations:
-                if loc:
-                    country = self.get_country_from_geonames(loc, self.geonames_username)
-                    if country:
-                        logger.info(f"✅ Found country '{country}' from location '{loc}' in adjacent sentence to keyword")
-                        return country, [loc]
+            country, loc = self._first_country(adjacent_locations)
+            if country:
+                logger.info(f"✅ Found country '{country}' from location '{loc}' in adjacent sentence to keyword")
+                return country, [loc]
         
-        # Strategy 3: Fallback - check top-K global locations (most frequent)
-        all_locations = self.extract_locations_from_text(text)
+        # Strategy 3: Fallback - check top-K global locations (most frequent across sentences)
+        all_locations = [loc for locations in sentence_locations for loc in locations]
         if all_locations:
             # Count frequency and get top-K (limit to 5 to avoid too many API calls)
             from collections import Counter
@@ -277,34 +460,31 @@ class UnifiedLocationProcessor:
             top_locations = [loc for loc, count in location_counts.most_common(5)]
             
             logger.info(f"🔍 Fallback: Checking top-{len(top_locations)} most frequent locations globally")
-            for loc in top_locations:
-                if loc:
-                    country = self.get_country_from_geonames(loc, self.geonames_username)
-                    if country:
-                        logger.info(f"✅ Found country '{country}' from top-K location '{loc}' (fallback)")
-                        return country, [loc]
+            country, loc = self._first_country(top_locations)
+            if country:
+                logger.info(f"✅ Found country '{country}' from top-K location '{loc}' (fallback)")
+                return country, [loc]
         
         return None, []
 
     def process_text(self, text, url=None):
         """
-        Process text to extract locations and find country using proximity to keywords.
-        If no locations found, tries to extract country from URL
+        Process text to find the country: a known source domain in the URL wins outright
+        (no NER or GeoNames work); otherwise locations near protest keywords, then any location.
         Returns: (locations_list, country_name) or (None, None) if no locations found
         """
         try:
             if not text:
                 return None, None
             
-            # Define protest keywords (from corpus.py)
-            protest_keywords = [
-                'protest', 'demonstration', 'rally', 'boycott', 'strike', 'walkout', 
-                'stoppage', 'workstop', 'gather', 'mobilize', 'march', 'picket',
-                'occupation', 'riot', 'blockade', 'activism', 'activist'
-            ]
+            # Cheapest signal first: the source domain maps straight to a country
+            url_country = self.get_country_from_url(url) if url else None
+            if url_country:
+                logger.info(f"✅ Found country '{url_country}' from URL")
+                return None, url_country
             
             # Try to find country based on keyword proximity
-            found_country, keyword_locations = self.find_country_near_keywords(text, protest_keywords)
+            found_country, keyword_locations = self.find_country_near_keywords(text, PROTEST_KEYWORDS)
             
             if found_country:
                 logger.info(f"✅ Found country '{found_country}' using keyword proximity")
@@ -313,25 +493,17 @@ class UnifiedLocationProcessor:
             # Fallback: Extract all locations and try GeoNames
             all_locations = self.extract_locations_from_text(str(text))
             cleaned_locations = []
+            seen = set()
             
             for loc in all_locations:
-                if loc and loc not in cleaned_locations:
+                if loc and loc not in seen:
+                    seen.add(loc)
                     cleaned_locations.append(loc)
                     country = self.get_country_from_geonames(loc, self.geonames_username)
                     if country:
                         logger.info(f"✅ Found country '{country}' from location '{loc}' (fallback)")
                         return cleaned_locations, country
 
-            # Final fallback: URL-based country detection
-            if url:
-                logger.info(f"🔍 No country found from locations, trying URL fallback: {url}")
-                url_country = self.get_country_from_url(url)
-                if url_country:
-                    logger.info(f"✅ Found country '{url_country}' from URL fallback")
-                    return cleaned_locations if cleaned_locations else None, url_country
-                else:
-                    logger.info(f"⚠️ No country found from URL fallback either")
-
             return cleaned_locations if cleaned_locations else None, None
             
         except Exception as e:
@@ -5,15 +5,26 @@ Contains functions for summarization, classification, and participant count extr
 
 import pickle
 import logging
+import threading
 from datetime import datetime, timezone, timedelta
 
 import torch
 import torch.nn.functional as F
+from pymongo import UpdateOne
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 
 from config import MODEL_PATHS, logger
 from utils import _make_fallback_summary
 
+# Inference-only models run in FP16 on GPU; CPUs stay in FP32 (half precision is slower there without native support)
+USE_CUDA = torch.cuda.is_available()
+INFERENCE_DTYPE = torch.float16 if USE_CUDA else torch.float32
+
+# Models are loaded once per process and shared by every pipeline run
+_MODEL_LOCK = threading.Lock()
+_MULTILABEL = None
+_SUMMARIZER = None
+
 # ===================== MULTILABEL CLASSIFICATION =====================
 
 def load_multilabel_model():
@@ -21,7 +32,9 @@ def load_multilabel_model():
     try:
         model_path = MODEL_PATHS['multilabel_roberta']
         tokenizer = AutoTokenizer.from_pretrained(model_path)
-        model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        model = AutoModelForSequenceClassification.from_pretrained(model_path, torch_dtype=INFERENCE_DTYPE)
+        if USE_CUDA:
+            model = model.to("cuda")
         model.eval()
         
         # Load label binarizer to get category names
@@ -33,55 +46,109 @@ def load_multilabel_model():
         print(f" Error loading multilabel model: {e}")
         return None, None, None
 
+def get_multilabel():
+    """Return the cached (tokenizer, model, label_binarizer), loading them on first use"""
+    global _MULTILABEL
+    with _MODEL_LOCK:
+        if _MULTILABEL is None:
+            loaded = load_multilabel_model()
+            if not all(loaded):
+                return loaded  # failed load: retry on the next call
+            _MULTILABEL = loaded
+        return _MULTILABEL
+
 def categorize_story_thread(text, tokenizer, model, label_binarizer):
     """Categorize story thread text"""
-    try:
-        if not all([tokenizer, model, label_binarizer]):
-            return {"category": "unknown", "confidence": 0.0, "all_predictions": {}}
-
-        text = text.strip()
-        if not text:
-            return {"category": "unknown", "confidence": 0.0, "all_predictions": {}}
-
-        # Truncate to 500 characters, but try to break at word boundary
-        if len(text) > 500:
-            truncated = text[:500]
-            last_space = truncated.rfind(' ')
-            if last_space > 400:
-                text = truncated[:last_space]
-            else:
-                text = truncated
-
-        inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True, max_length=512)
-        with torch.no_grad():
-            outputs = model(**inputs)
-            probs = torch.sigmoid(outputs.logits)
-
-        predictions = (probs > 0.5).squeeze().cpu().numpy()
-        categories = getattr(label_binarizer, 'classes_', [f"Category_{i}" for i in range(len(predictions))])
-
-        max_prob_idx = torch.argmax(probs).item()
-        max_prob = probs[0][max_prob_idx].item()
-
-        high_confidence_predictions = {
-            category: float(prob)
-            for category, prob in zip(categories, probs[0].cpu().numpy()) if prob > 0.5
-        }
-
-        predicted_category = categories[max_prob_idx] if max_prob > 0.5 else "unknown"
-
-        return {
-            "category": predicted_category,
-            "confidence": float(max_prob),
-            "all_predictions": high_confidence_predictions
-        }
+    return categorize_story_threads_batch([text], tokenizer, model, label_binarizer)[0]
+
+def categorize_story_threads_batch(texts, tokenizer, model, label_binarizer, batch_size=16):
+    """Categorize several story thread texts, one model forward pass per batch of batch_size"""
+    unknown = {"category": "unknown", "confidence": 0.0, "all_predictions": {}}
+    results = [dict(unknown) for _ in texts]
+    if not all([tokenizer, model, label_binarizer]):
+        return results
+
+    # Empty texts stay "unknown" and are not sent to the model
+    indexed = [(i, text.strip()) for i, text in enumerate(texts) if text and text.strip()]
+
+    for start in range(0, len(indexed), batch_size):
+        chunk = indexed[start:start + batch_size]
+        try:
+            # The tokenizer truncates to the model's 512-token limit
+            inputs = tokenizer([text for _, text in chunk], return_tensors="pt",
+                               padding=True, truncation=True, max_length=512).to(model.device)
+            with torch.inference_mode():
+                outputs = model(**inputs)
+                probs = torch.sigmoid(outputs.logits.float()).cpu()
+
+            categories = getattr(label_binarizer, 'classes_', [f"Category_{i}" for i in range(probs.shape[1])])
+
+            for (i, _), row in zip(chunk, probs):
+                max_prob_idx = torch.argmax(row).item()
+                max_prob = row[max_prob_idx].item()
+
+                high_confidence_predictions = {
+                    category: float(prob)
+                    for category, prob in zip(categories, row.numpy()) if prob > 0.5
+                }
 
-    except Exception as e:
-        print(f" Error in story thread categorization: {e}")
-        return {"category": "unknown", "confidence": 0.0, "all_predictions": {}}
+                predicted_category = categories[max_prob_idx] if max_prob > 0.5 else "unknown"
+
+                results[i] = {
+                    "category": predicted_category,
+                    "confidence": float(max_prob),
+                    "all_predictions": high_confidence_predictions
+                }
+
+        except Exception as e:
+            print(f" Error in story thread categorization: {e}")
+
+    return results
 
 # ===================== SUMMARIZATION =====================
 
+# Articles summarized per pipeline call
+SUMMARY_BATCH_SIZE = 8
+# Article updates sent per bulk_write
+UPDATE_BATCH_SIZE = 100
+
+def get_summarizer():
+    """Return the cached BART summarization pipeline, building it on first use"""
+    global _SUMMARIZER
+    with _MODEL_LOCK:
+        if _SUMMARIZER is None:
+            _SUMMARIZER = pipeline("summarization", model="facebook/bart-large-cnn",
+                                   device=0 if USE_CUDA else -1, torch_dtype=INFERENCE_DTYPE)
+            # Reuse past key/values between decoding steps during generation
+            _SUMMARIZER.model.config.use_cache = True
+        return _SUMMARIZER
+
+def summarize_batch(summarizer, texts):
+    """Summarize several article texts, with one batched pipeline call per summary-length bucket"""
+    summaries = [None] * len(texts)
+    buckets = {}
+    for i, text in enumerate(texts):
+        word_count = len(text.split())
+        if word_count < 10:
+            summaries[i] = text or _make_fallback_summary(text)
+        elif not summarizer:
+            summaries[i] = _make_fallback_summary(text)
+        else:
+            lengths = (50, 25) if word_count > 70 else (20, 10)
+            buckets.setdefault(lengths, []).append(i)
+
+    for (max_len, min_len), indexes in buckets.items():
+        try:
+            results = summarizer([texts[i] for i in indexes], batch_size=len(indexes),
+                                 max_length=max_len, min_length=min_len, do_sample=False, truncation=True)
+            for i, result in zip(indexes, results):
+                summaries[i] = result['summary_text']
+        except Exception:
+            for i in indexes:
+                summaries[i] = _make_fallback_summary(texts[i])
+
+    return summaries
+
 def generate_summaries_and_labels():
     """Generate summary, multilabel classification, and participant count for recent articles"""
     try:
@@ -97,73 +164,74 @@ def generate_summaries_and_labels():
         six_hours_ago = now - timedelta(hours=6)
         print(f"Searching for articles imported after {six_hours_ago}")
 
-        articles = list(records_final.find({"imported_at": {"$gte": six_hours_ago}}))
+        # Only _id and text are used below
+        projection = {"_id": 1, "text": 1}
+
+        articles = list(records_final.find({"imported_at": {"$gte": six_hours_ago}}, projection))
         print(f"Found {len(articles)} recent articles")
 
         if not articles:
             print(" No recent articles found, looking for articles without imported_at field...")
-            articles = list(records_final.find({"imported_at": {"$exists": False}}))
+            articles = list(records_final.find({"imported_at": {"$exists": False}}, projection))
             print(f"Found {len(articles)} articles without imported_at field")
             if not articles:
                 print(" No articles without imported_at found, getting all articles...")
-                articles = list(records_final.find({}))
+                articles = list(records_final.find({}, projection))
                 print(f"Found {len(articles)} total articles")
 
         if not articles:
             return 0
 
-        summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        summarizer = get_summarizer()
 
-        tokenizer, model, label_binarizer = load_multilabel_model()
+        tokenizer, model, label_binarizer = get_multilabel()
 
         updated_articles = []
-        for idx, article in enumerate(articles):
-            try:
-                article_id = article['_id']                
-                               
-                article_text = article.get('text').strip()
-
-                if not article_text or len(article_text.split()) < 10:
-                    summary = article.get('text', '') or _make_fallback_summary(article_text)
-                else:
-                    if summarizer:
-                        word_count = len(article_text.split())
-                        max_len = 50 if word_count > 70 else 20
-                        min_len = 25 if word_count > 70 else 10
-                        try:
-                            summary = summarizer(article_text, max_length=max_len, min_length=min_len, do_sample=False)[0]['summary_text']
-                        except Exception:
-                            summary = _make_fallback_summary(article_text)
-                    else:
-                        summary = _make_fallback_summary(article_text)
-
-                category_result = categorize_story_thread(article_text, tokenizer, model, label_binarizer)
-                category_result.setdefault("category", "unknown")
-                category_result.setdefault("confidence", 0.0)
-                category_result.setdefault("all_predictions", {})
-
-                update_fields = {
-                    'summary': summary,
-                    'category': category_result.get('category', 'unknown'),
-                    'confidence': category_result.get('confidence', 0.0),
-                    'all_predictions': category_result.get('all_predictions', {}),
-                }
-
-                records_final.update_one({'_id': article_id}, {'$set': update_fields})
-                updated_articles.append(article_id)
-
-                if idx % 10 == 0:
-                    print(f" Processed {idx + 1}/{len(articles)}")
-
-            except Exception as e:
-                print(f" Error processing article: {e}")
-                logger.error(f"Error processing article {article.get('_id', '')}: {e}")
-                continue
+        skipped_articles = 0
+        bulk_ops = []
+        for start in range(0, len(articles), SUMMARY_BATCH_SIZE):
+            batch = articles[start:start + SUMMARY_BATCH_SIZE]
+            texts = [(article.get('text') or '').strip() for article in batch]
+            summaries = summarize_batch(summarizer, texts)
+            category_results = categorize_story_threads_batch(texts, tokenizer, model, label_binarizer)
+
+            for article, summary, category_result in zip(batch, summaries, category_results):
+                try:
+                    article_id = article['_id']
+
+                    category_result.setdefault("category", "unknown")
+                    category_result.setdefault("confidence", 0.0)
+                    category_result.setdefault("all_predictions", {})
+
+                    update_fields = {
+                        'summary': summary,
+                        'category': category_result.get('category', 'unknown'),
+                        'confidence': category_result.get('confidence', 0.0),
+                        'all_predictions': category_result.get('all_predictions', {}),
+                    }
+
+                    bulk_ops.append(UpdateOne({'_id': article_id}, {'$set': update_fields}))
+                    updated_articles.append(article_id)
+
+                except Exception as e:
+                    print(f" Error processing article: {e}")
+                    logger.error(f"Error processing article {article.get('_id', '')}: {e}")
+                    skipped_articles += 1
+                    continue
+
+            if len(bulk_ops) >= UPDATE_BATCH_SIZE:
+                records_final.bulk_write(bulk_ops, ordered=False)
+                bulk_ops.clear()
+
+            print(f" Processed {start + len(batch)}/{len(articles)}")
+
+        if bulk_ops:
+            records_final.bulk_write(bulk_ops, ordered=False)
 
         print("\n" + "="*80)
         print(f" Finished! Total articles updated: {len(updated_articles)}")
         print("="*80)
-        print(f" Skipped articles (already processed): {skipped_articles}")
+        print(f" Skipped articles (processing errors): {skipped_articles}")
 
         return len(updated_articles)
 
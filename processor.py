@@ -13,43 +13,33 @@ from config import CONNECTION_STRING, logger
 def process_article_locations_and_countries(article, location_processor=None):
     """Process a single article to extract locations and determine country"""
     try:
-        # Initialize location processor if not provided
+        # Initialize location processor if not provided (its GeoNames session,
+        # rate limit and cache are process-wide, so there is nothing to close)
         if location_processor is None:
             from location_extractor import UnifiedLocationProcessor
             location_processor = UnifiedLocationProcessor(CONNECTION_STRING)
-            should_close_connection = True
-        else:
-            should_close_connection = False
-        
-        # Extract locations from compact_article field only
-        all_locations = []
         
         # Use only compact_article field
         article_text = ""
         if 'compact_article' in article and article['compact_article']:
             article_text = str(article['compact_article'])
         
-        if article_text.strip():
-            # Extract locations using spaCy
-            locations = location_processor.extract_locations_from_text(article_text)
-            all_locations.extend(locations)
-        
-        # Clean locations
+        # A known source domain gives the country directly (an O(1) lookup); only
+        # otherwise run spaCy and fan out over the locations with GeoNames lookups
+        url = article.get('url')
+        found_country = location_processor.get_country_from_url(url) if url else None
         cleaned_locations = []
-        for location in all_locations:
-            cleaned_location = location_processor.clean_location(location)
-            if cleaned_location and cleaned_location not in cleaned_locations:
-                cleaned_locations.append(cleaned_location)
-        
-        # Try to find country from locations
-        found_country = None
-        if cleaned_locations:
-            for location in cleaned_locations:
-                country = location_processor.get_country_from_location(location)
+        if found_country:
+            print(f"Found country '{found_country}' from URL")
+        elif article_text.strip():
+            locations = location_processor.extract_locations_from_text(article_text)
+            # Strip and drop duplicates, keeping first-seen order
+            cleaned_locations = list(dict.fromkeys(loc.strip() for loc in locations if loc and loc.strip()))
+            if cleaned_locations:
+                country, location = location_processor.get_country_from_locations(cleaned_locations)
                 if country:
                     found_country = country
                     print(f"Found country '{country}' from location '{location}'")
-                    break
         
         # Add location and country fields to article
         article['locations'] = cleaned_locations  
@@ -87,10 +77,6 @@ def process_article_locations_and_countries(article, location_processor=None):
             except Exception as e:
                 print(f" Error extracting participant counts: {e}")
         
-        # Close connection if we created it
-        if should_close_connection:
-            location_processor.close_connection()
-        
         return article
         
     except Exception as e:
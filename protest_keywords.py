@@ -1,4 +1,30 @@
+import hashlib
+import os
+import pickle
 import re
+import sys
+import threading
+import unicodedata
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # optional: SIMD multi-literal keyword scanning
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2  # optional: linear-time regex engine for the fallback scan
+except ImportError:
+    re2 = None
+
+try:
+    from pygments.regexopt import regex_opt
+except ImportError:
+    regex_opt = None
 
 # Define protest keywords and prefix mapping
 PREFIX_MAP = {
@@ -24,12 +50,12 @@ PREFIX_MAP = {
     "blocade"    : "blocade",
 }
 # EU countries list
-EU_COUNTRIES = {
+EU_COUNTRIES = frozenset({
     'austria', 'belgium', 'bulgaria', 'croatia', 'cyprus', 'czech republic',
     'denmark', 'estonia', 'finland', 'france', 'germany', 'greece', 'hungary', 'ireland',
     'italy', 'latvia', 'lithuania', 'luxembourg', 'malta', 'netherlands', 'poland',
     'portugal', 'romania', 'slovakia', 'slovenia', 'spain', 'sweden', 'europe'
-}
+})
 
 
 root_words = ['protest', 'protested', 'protesters', 'protesting', 'demonstration', 'demonstrations', 'demonstrator',
@@ -46,15 +72,24 @@ CSV_FIELDS = [
 ]
 
 
+def stem_pattern(words):
+    """
+    Compile a word-start match for any of the stems, letting pygments fold shared
+    prefixes into a trie-shaped alternation when it is installed.
+    """
+    if regex_opt is not None:
+        return re.compile(regex_opt(words, prefix=r"\b", suffix=r"\w*\b"))
+    # Longest first, so a longer stem is tried before any prefix of it
+    return re.compile(r"\b(?:%s)\w*\b" % "|".join(sorted(set(words), key=len, reverse=True)))
+
+
 GREEK_PROTEST_STEMS = [
     "ΔΙΑΜΑΡΤ", "ΔΙΑΔΗΛΩ", "ΣΥΓΚΕΝΤΡΩ",
     "ΑΚΤΙΒΙΣ", "ΑΠΕΡΓ", "ΔΙΑΚΟΠ",
     "ΔΙΕΚΟΨ"
 ]
 
-PROTEST_RE = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(GREEK_PROTEST_STEMS)
-)
+PROTEST_RE = stem_pattern(GREEK_PROTEST_STEMS)
 
 en_words = ['protest', 'boycott', 'strike', 'walkout', 'march', 'travail', 'stoppage', 'workstop', 'picket', 'gather',
               'opposant', 'demonstr', 'rall', 'activis', 'stroke', 'mobilize']
@@ -217,46 +252,248 @@ root_words_sk = [
 root_words_da = [
     "protest", "demonstr", "optog","march", "siddestrejke", "strejke", "boykot", "blokade", "blokere", "aktivis", "mobiliser"]
 
-en_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(en_words)
-)
-
-nl_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(root_words_nl)
-)
-pt_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(pt_words)
-)
-da_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(da_words)
-)
-et_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(et_words)
-)
-fi_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(fi_words)
-)
-fr_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(fr_words)
-)
-hu_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(hu_words)
-)
-de_en_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(de_en_words)
-)
-it_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(it_words)
-)
-lt_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(lt_words)
-)
-lv_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(lv_words)
-)
-ro_protest = re.compile(
-    r"\b(?:%s)\w*\b" % "|".join(ro_words)
-)
+# Drop repeated stems within each list and intern the rest, so a stem shared by
+# many languages ("protest", "aktivis", ...) is one string object everywhere.
+# Lists are rewritten in place because config imports them by name.
+for _words in (
+    root_words, en_words, pt_words, de_en_words, root_words_bg, pl_words, hr_words, ro_words,
+    de_words, lt_words, root_words_nl, root_words_el_expanded, root_words_sv,
+    root_words_extended_cs, da_words, et_words, fi_words, fr_words, it_words, hu_words,
+    lv_words, root_words_sk, root_words_da,
+):
+    _words[:] = [sys.intern(word) for word in dict.fromkeys(_words)]
+del _words
+
+en_protest = stem_pattern(en_words)
+
+nl_protest = stem_pattern(root_words_nl)
+pt_protest = stem_pattern(pt_words)
+da_protest = stem_pattern(da_words)
+et_protest = stem_pattern(et_words)
+fi_protest = stem_pattern(fi_words)
+fr_protest = stem_pattern(fr_words)
+hu_protest = stem_pattern(hu_words)
+de_en_protest = stem_pattern(de_en_words)
+it_protest = stem_pattern(it_words)
+lt_protest = stem_pattern(lt_words)
+lv_protest = stem_pattern(lv_words)
+ro_protest = stem_pattern(ro_words)
+
+# ===================== AHO-CORASICK MATCHING =====================
+# One automaton over every language's stems replaces a separate regex pass per
+# language; each stem maps to the languages whose list contains it.
+PROTEST_LANG_WORDS = {
+    'en': en_words, 'nl': root_words_nl, 'pt': pt_words, 'da': da_words,
+    'et': et_words, 'fi': fi_words, 'fr': fr_words, 'hu': hu_words,
+    'de_en': de_en_words, 'it': it_words, 'lt': lt_words, 'lv': lv_words,
+    'ro': ro_words,
+}
+
+PROTEST_PATTERN_LANGS = {
+    en_protest: 'en', nl_protest: 'nl', pt_protest: 'pt', da_protest: 'da',
+    et_protest: 'et', fi_protest: 'fi', fr_protest: 'fr', hu_protest: 'hu',
+    de_en_protest: 'de_en', it_protest: 'it', lt_protest: 'lt', lv_protest: 'lv',
+    ro_protest: 'ro',
+}
+
+# Many stems ("protest", "sit-in", "aktivis", ...) repeat across languages, so
+# keep one entry per stem with the languages that use it.
+def _build_stem_table():
+    stem_to_langs = {}
+    for lang, words in PROTEST_LANG_WORDS.items():
+        for stem in words:
+            stem_to_langs.setdefault(stem.lower(), set()).add(lang)
+    return {stem: frozenset(langs) for stem, langs in stem_to_langs.items()}
+
+
+STEM_TO_LANGS = _build_stem_table()
+STEM_LENGTHS = sorted({len(stem) for stem in STEM_TO_LANGS})
+
+# Fallback for when neither hyperscan nor pyahocorasick is installed: a single
+# regex over the unique stems, searched once per word start that holds a stem.
+# RE2 scans in linear time but has an ASCII-only \b, so its word start is
+# spelled out with Unicode classes.
+_ANY_STEMS = "|".join(re.escape(stem) for stem in sorted(STEM_TO_LANGS, key=len))
+if re2 is not None:
+    PROTEST_ANY_RE = re2.compile(r"(?:^|[^\p{L}\p{N}_])(%s)" % _ANY_STEMS)
+else:
+    PROTEST_ANY_RE = re.compile(r"\b(%s)" % _ANY_STEMS)
+
+
+PROTEST_AC_CACHE_DIR = os.environ.get("PROTEST_AC_CACHE_DIR", ".")
+
+
+def _build_automaton():
+    """Build the shared stem automaton, or None when pyahocorasick is not installed."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for stem, langs in STEM_TO_LANGS.items():
+        automaton.add_word(stem, (stem, langs))
+    automaton.make_automaton()
+    return automaton
+
+
+def _build_or_load_automaton():
+    """
+    Load the automaton pickled by a previous run, building and saving it on a miss.
+    The word lists are hashed into the file name so editing them invalidates the cache.
+    """
+    if ahocorasick is None:
+        return None
+    digest = hashlib.sha256(
+        repr(sorted((lang, tuple(words)) for lang, words in PROTEST_LANG_WORDS.items())).encode()
+    ).hexdigest()[:16]
+    path = os.path.join(PROTEST_AC_CACHE_DIR, f"protest_ac_{digest}.pkl")
+    if os.path.exists(path):
+        try:
+            return ahocorasick.load(path, pickle.loads)
+        except Exception as e:
+            print(f"⚠️ Could not load keyword automaton cache {path}: {e}")
+    automaton = _build_automaton()
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        automaton.save(tmp_path, pickle.dumps)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not save keyword automaton cache {path}: {e}")
+    return automaton
+
+
+def _build_hyperscan_db():
+    """
+    Compile every unique stem as a literal into one Hyperscan block-mode database,
+    or return None when hyperscan is not installed.
+    """
+    if hyperscan is None:
+        return None
+    stems = list(STEM_TO_LANGS)
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(expressions=[re.escape(stem).encode('utf-8') for stem in stems],
+               ids=list(range(len(stems))), elements=len(stems), flags=[0] * len(stems))
+    return db, [(len(stem.encode('utf-8')), STEM_TO_LANGS[stem]) for stem in stems]
+
+
+HS_STATE = _build_hyperscan_db()
+_HS_LOCAL = threading.local()
+
+# The automaton is only needed when hyperscan is not available
+AUTOMATON = _build_or_load_automaton() if HS_STATE is None else None
+
+
+def _starts_word(text, start):
+    """Mirror the regex word boundary: the stem must not continue a previous word."""
+    if start == 0:
+        return True
+    prev = text[start - 1]
+    return not (prev.isalnum() or prev == '_')
+
+
+def _scan_hyperscan(text):
+    """Return the language sets of stems that start a word, from a single Hyperscan pass."""
+    db, stem_info = HS_STATE
+    # Scratch space is per thread; crawlers call this from several threads at once
+    scratch = getattr(_HS_LOCAL, 'scratch', None)
+    if scratch is None:
+        scratch = _HS_LOCAL.scratch = hyperscan.Scratch(db)
+    text_b = text.encode('utf-8')
+    hits = []
+
+    def on_match(stem_id, start, end, flags, context):
+        length, stem_langs = stem_info[stem_id]
+        start = end - length
+        # Hyperscan's \b is ASCII-only, so check the preceding character ourselves
+        prev = text_b[max(0, start - 4):start].decode('utf-8', errors='ignore')
+        if not prev or _starts_word(prev, len(prev)):
+            hits.append(stem_langs)
+
+    db.scan(text_b, match_event_handler=on_match, scratch=scratch)
+    return hits
+
+
+def _iter_protest_hits(text):
+    """Yield the language sets of stems that start a word in already-lowercased text."""
+    if HS_STATE is not None:
+        yield from _scan_hyperscan(text)
+        return
+    if AUTOMATON is None:
+        pos = 0
+        while True:
+            match = PROTEST_ANY_RE.search(text, pos)
+            if match is None:
+                return
+            start = match.start(1)
+            # Every stem at this word start, including longer multi-word ones
+            for length in STEM_LENGTHS:
+                stem_langs = STEM_TO_LANGS.get(text[start:start + length])
+                if stem_langs:
+                    yield stem_langs
+            pos = start + 1
+    for end, (stem, stem_langs) in AUTOMATON.iter(text):
+        if _starts_word(text, end - len(stem) + 1):
+            yield stem_langs
+
+
+def find_protest_langs(text):
+    """Return the set of languages whose protest stems start a word in text."""
+    langs = set()
+    for stem_langs in _iter_protest_hits(text.lower()):
+        langs |= stem_langs
+    return langs
+
+
+def maybe_has_protest(text, stems):
+    """
+    Cheap literal pre-filter: False means none of the stems occurs anywhere in text,
+    so no word-boundary match is possible. Each check is a C-level substring search.
+    """
+    return any(stem in text for stem in stems)
+
+
+def protest_search(pattern, text):
+    """
+    Drop-in for bool(pattern.search(text.lower())) that uses the shared stem table when it can.
+    The text is lowercased here once, and the scan stops at the first stem of the pattern's language.
+    """
+    text = text.lower()
+    lang = PROTEST_PATTERN_LANGS.get(pattern)
+    if lang is None:
+        return bool(pattern.search(text))
+    # The regex fallback is slow enough that rejecting articles without any stem up front pays off
+    if HS_STATE is None and AUTOMATON is None and not maybe_has_protest(text, PROTEST_LANG_WORDS[lang]):
+        return False
+    return any(lang in stem_langs for stem_langs in _iter_protest_hits(text))
+
+
+def _build_greek_automaton():
+    """Automaton over the uppercase Greek stems, or None when pyahocorasick is not installed."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for stem in GREEK_PROTEST_STEMS:
+        automaton.add_word(stem, stem)
+    automaton.make_automaton()
+    return automaton
+
+
+GREEK_AC = _build_greek_automaton()
+
+
+def find_greek_protest(text):
+    """Return the first Greek protest stem starting a word in text, or None."""
+    text = unicodedata.normalize("NFC", text).upper()
+    if GREEK_AC is None:
+        if not maybe_has_protest(text, GREEK_PROTEST_STEMS):
+            return None
+        match = PROTEST_RE.search(text)
+        if match is None:
+            return None
+        return next(stem for stem in GREEK_PROTEST_STEMS if match.group(0).startswith(stem))
+    for end, stem in GREEK_AC.iter(text):
+        if _starts_word(text, end - len(stem) + 1):
+            return stem
+    return None
+
 
 malta_url_rss = 'https://timesofmalta.com/sitemap_latest.xml'
 poland_url_rss = 'https://www.rp.pl/sitemaps/news-sitemap.xml'
@@ -1,15 +1,25 @@
 import logging
+import orjson
 import requests
 from transformers import MarianMTModel, MarianTokenizer
 import nltk
-from nltk.tokenize import sent_tokenize
 import time
 import os
+import re
+import hashlib
+import sqlite3
 import threading
+from collections import OrderedDict
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from time import monotonic, sleep
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import httpx  # optional: HTTP/2 multiplexing for translation requests
+except ImportError:
+    httpx = None
 
 # Ensure NLTK punkt tokenizer is available
 try:
@@ -23,11 +33,13 @@ except LookupError:
 # Quiet noisy libs
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("requests").setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # ---- Global translate client session + concurrency guard --------------
-_TRANSLATE_SESSION: Optional[requests.Session] = None
+# requests.Session, or an HTTP/2 httpx.Client when httpx and h2 are installed
+_TRANSLATE_SESSION = None
 _TRANSLATE_SESSION_LOCK = threading.Lock()
 TRANSLATE_CONCURRENCY = int(os.environ.get("TRANSLATE_CONCURRENCY", "3"))
 _TRANSLATE_SEM = threading.BoundedSemaphore(TRANSLATE_CONCURRENCY)
@@ -52,10 +64,31 @@ def _respect_retry_after(resp: requests.Response) -> float:
             return 0.0
 
 
-def _get_translate_session() -> requests.Session:
+def _build_http2_client():
+    """
+    One HTTP/2 client whose connections multiplex concurrent translation requests,
+    or None when httpx (with h2) is unavailable. Retry-After is handled by callers.
+    """
+    if httpx is None:
+        return None
+    try:
+        transport = httpx.HTTPTransport(
+            http2=True,
+            retries=2,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=256),
+        )
+    except ImportError:
+        # httpx without the h2 extra
+        return None
+    return httpx.Client(transport=transport, timeout=10.0)
+
+
+def _get_translate_session():
     global _TRANSLATE_SESSION
     if _TRANSLATE_SESSION is None:
         with _TRANSLATE_SESSION_LOCK:
+            if _TRANSLATE_SESSION is None:
+                _TRANSLATE_SESSION = _build_http2_client()
             if _TRANSLATE_SESSION is None:
                 s = requests.Session()
                 adapter = HTTPAdapter(
@@ -74,13 +107,102 @@ def _get_translate_session() -> requests.Session:
     return _TRANSLATE_SESSION
 
 
+# ---- Translation cache (memory LRU in front of SQLite) ----------------
+TRANSLATE_CACHE_PATH = os.environ.get("TRANSLATE_CACHE_PATH", "translations.db")
+TRANSLATE_MEMO_SIZE = 50_000
+_TRANSLATE_MEMO: "OrderedDict[tuple, str]" = OrderedDict()
+_TRANSLATE_CACHE: Optional[sqlite3.Connection] = None
+_TRANSLATE_CACHE_LOCK = threading.Lock()
+
+
+def _translation_key(q: str, source: str, target: str) -> tuple:
+    return hashlib.blake2b(str(q).encode("utf-8"), digest_size=16).hexdigest(), source, target
+
+
+def _get_translate_cache() -> sqlite3.Connection:
+    # Caller holds _TRANSLATE_CACHE_LOCK
+    global _TRANSLATE_CACHE
+    if _TRANSLATE_CACHE is None:
+        _TRANSLATE_CACHE = sqlite3.connect(TRANSLATE_CACHE_PATH, check_same_thread=False)
+        _TRANSLATE_CACHE.execute(
+            "CREATE TABLE IF NOT EXISTS tr(h TEXT, source TEXT, target TEXT, text TEXT, "
+            "PRIMARY KEY (h, source, target))"
+        )
+        _TRANSLATE_CACHE.commit()
+    return _TRANSLATE_CACHE
+
+
+def _remember_translation(key: tuple, text: str) -> None:
+    # Caller holds _TRANSLATE_CACHE_LOCK
+    _TRANSLATE_MEMO[key] = text
+    _TRANSLATE_MEMO.move_to_end(key)
+    if len(_TRANSLATE_MEMO) > TRANSLATE_MEMO_SIZE:
+        _TRANSLATE_MEMO.popitem(last=False)
+
+
+def _read_translation(key: tuple) -> Optional[str]:
+    """Return a cached translation from memory or disk, or None on a miss."""
+    with _TRANSLATE_CACHE_LOCK:
+        text = _TRANSLATE_MEMO.get(key)
+        if text is not None:
+            _TRANSLATE_MEMO.move_to_end(key)
+            return text
+        row = _get_translate_cache().execute(
+            "SELECT text FROM tr WHERE h=? AND source=? AND target=?", key
+        ).fetchone()
+        if row is None:
+            return None
+        _remember_translation(key, row[0])
+        return row[0]
+
+
+def _write_translation(key: tuple, text: str) -> None:
+    with _TRANSLATE_CACHE_LOCK:
+        _remember_translation(key, text)
+        cache = _get_translate_cache()
+        cache.execute("INSERT OR REPLACE INTO tr(h, source, target, text) VALUES (?, ?, ?, ?)", (*key, text))
+        cache.commit()
+
+
 # ---- Per-country Session Pool -----------------------------------------
+USER_AGENT = "European-Strikes-News-Extraction/1.0"
+COUNTRY_ACCEPT_LANGUAGE = {
+    "austria": "de", "belgium": "fr", "bulgaria": "bg", "croatia": "hr", "cyprus": "el",
+    "czech": "cs", "denmark": "da", "estonia": "et", "finland": "fi", "france": "fr",
+    "germany": "de", "greece": "el", "hungary": "hu", "ireland": "en", "italy": "it",
+    "latvia": "lv", "lithuania": "lt", "luxembourg": "de", "malta": "en",
+    "netherlands": "nl", "poland": "pl", "portugal": "pt", "romania": "ro",
+    "slovakia": "sk", "slovenia": "sl", "spain": "en", "sweden": "sv",
+}
+
+
+def apply_country_headers(sess: requests.Session, country: Optional[str]) -> requests.Session:
+    """Set the headers that are constant per country once on the session instead of per request."""
+    lang = COUNTRY_ACCEPT_LANGUAGE.get((country or "").lower(), "en")
+    sess.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Language": lang if lang == "en" else f"{lang},en;q=0.8",
+    })
+    return sess
+
+
 _SESSION_POOL: Dict[str, requests.Session] = {}
 _SESSION_POOL_LOCK = threading.Lock()
+# Per-thread view of the pool; close_all_sessions() bumps the generation to invalidate it
+_SESSION_TLS = threading.local()
+_SESSION_POOL_GEN = 0
 
 
 def get_country_session(country: Optional[str]) -> requests.Session:
     key = (country or "default").lower()
+    if getattr(_SESSION_TLS, "gen", None) != _SESSION_POOL_GEN:
+        _SESSION_TLS.gen = _SESSION_POOL_GEN
+        _SESSION_TLS.sessions = {}
+    local = _SESSION_TLS.sessions
+    sess = local.get(key)
+    if sess is not None:
+        return sess
+
     sess = _SESSION_POOL.get(key)
     if sess is None:
         with _SESSION_POOL_LOCK:
@@ -99,12 +221,16 @@ def get_country_session(country: Optional[str]) -> requests.Session:
                 )
                 sess.mount("http://", adapter)
                 sess.mount("https://", adapter)
+                apply_country_headers(sess, country)
                 _SESSION_POOL[key] = sess
+    local[key] = sess
     return sess
 
 
 def close_all_sessions() -> None:
     # Close country-specific sessions
+    global _SESSION_POOL_GEN
+    _SESSION_POOL_GEN += 1
     for s in list(_SESSION_POOL.values()):
         try:
             s.close()
@@ -121,6 +247,16 @@ def close_all_sessions() -> None:
             pass
         _TRANSLATE_SESSION = None
 
+    # Close the translation cache
+    global _TRANSLATE_CACHE
+    with _TRANSLATE_CACHE_LOCK:
+        if _TRANSLATE_CACHE is not None:
+            try:
+                _TRANSLATE_CACHE.close()
+            except Exception:
+                pass
+            _TRANSLATE_CACHE = None
+
 
 # -----------------------------------------------------------------------
 COUNTRY_DELAY_SEC = {
@@ -154,31 +290,35 @@ COUNTRY_DELAY_SEC = {
     "slovenia": 1,
 }
 
-from collections import defaultdict
-
-
 class CountryRateLimiter:
+    # Unknown or empty country names share one bucket, so the lock and timestamp
+    # tables stay bounded by the configured countries
+    DEFAULT_KEY = "_default"
+
     def __init__(self, delays_sec: Dict[str, float], default_sec: float = 1.0):
         self.delays = {k.lower(): float(v) for k, v in delays_sec.items()}
         self.default = float(default_sec)
         self._last_call: Dict[str, float] = {}
-        self._locks = defaultdict(threading.Lock)  # per-country lock
+        # per-country lock, fixed at construction
+        self._locks = {k: threading.Lock() for k in [*self.delays, self.DEFAULT_KEY]}
 
     def wait(self, country: str) -> None:
         key = (country or "").lower()
+        if key not in self.delays:
+            key = self.DEFAULT_KEY
         delay = self.delays.get(key, self.default)
         if delay <= 0:
             return
 
-        lock = self._locks[key]
-        with lock:
+        # Reserve the next slot under the lock and sleep outside it, so callers for
+        # the same country never queue behind a thread that is sleeping
+        with self._locks[key]:
             now = monotonic()
-            last = self._last_call.get(key, 0.0)
-            next_allowed = max(last + delay, now)
-            wait_for = next_allowed - now
-            if wait_for > 0:
-                sleep(wait_for)
-            self._last_call[key] = monotonic()
+            next_allowed = max(self._last_call.get(key, 0.0) + delay, now)
+            self._last_call[key] = next_allowed
+        wait_for = next_allowed - now
+        if wait_for > 0:
+            sleep(wait_for)
 
 
 rate_limiter = CountryRateLimiter(COUNTRY_DELAY_SEC)
@@ -205,6 +345,37 @@ def throttled_get(
     return resp
 
 
+def fetch_many(jobs: List[tuple], *, timeout: float = 10) -> List[Optional[requests.Response]]:
+    """
+    Fetch (country, url) jobs concurrently, one worker per distinct country, so one
+    country's cooldown overlaps other countries' requests. Jobs for the same country
+    are still spaced by the rate limiter. Results come back in job order; a failed
+    fetch yields None.
+    """
+    if not jobs:
+        return []
+
+    # Each worker owns one country's jobs, so a cooldown only ever blocks that country
+    by_country: Dict[str, List[int]] = {}
+    for i, (country, _) in enumerate(jobs):
+        by_country.setdefault(country, []).append(i)
+
+    results: List[Optional[requests.Response]] = [None] * len(jobs)
+
+    def fetch_country(country, indices):
+        for i in indices:
+            url = jobs[i][1]
+            try:
+                results[i] = throttled_get(url, country, timeout=timeout)
+            except requests.RequestException as e:
+                logger.warning(f"[{country}] Fetch failed for {url}: {e}")
+
+    with ThreadPoolExecutor(max_workers=len(by_country)) as pool:
+        for future in [pool.submit(fetch_country, country, indices) for country, indices in by_country.items()]:
+            future.result()
+    return results
+
+
 # ----------------------------------------------------------------------
 # Translation pipeline
 
@@ -212,11 +383,23 @@ def throttled_get(
 def translate(q: str, source: str, target: str) -> str:
     """
     Enhanced translation with: local service -> Google endpoint -> googletrans fallback.
-    Respects concurrency & Retry-After.
+    Respects concurrency & Retry-After. Results are cached by content hash across runs.
     """
     if not q or not str(q).strip():
         return q
 
+    key = _translation_key(q, source, target)
+    cached = _read_translation(key)
+    if cached is not None:
+        return cached
+    result = _translate_uncached(q, source, target)
+    # An unchanged result usually means every tier failed; don't pin it in the cache
+    if result and result != q:
+        _write_translation(key, result)
+    return result
+
+
+def _translate_uncached(q: str, source: str, target: str) -> str:
     # 1) Try local LibreTranslate-compatible service
     local_url = os.environ.get("LOCAL_TRANSLATE_URL", "http://127.0.0.1:5000/translate")
     data = {"q": q, "source": source, "target": target, "format": "text"}
@@ -231,7 +414,7 @@ def translate(q: str, source: str, target: str) -> str:
                 with _TRANSLATE_SEM:
                     response = sess.post(local_url, json=data, timeout=10)
         response.raise_for_status()
-        js = response.json()
+        js = orjson.loads(response.content)
         if isinstance(js, dict) and "translatedText" in js:
             return js["translatedText"]
         # Some LT-compatible servers return a list of segments
@@ -241,6 +424,11 @@ def translate(q: str, source: str, target: str) -> str:
     except Exception as e:
         logger.warning(f"Local translation service failed ({e}). Fallback to Google endpoint...")
 
+    return _translate_fallback(q, source, target)
+
+
+def _translate_fallback(q: str, source: str, target: str) -> str:
+    """Google endpoint -> googletrans tiers of translate(), used once the local service has failed."""
     # 2) Fallback to Google Translate (unofficial)
     try:
         url = "https://translate.googleapis.com/translate_a/single"
@@ -255,7 +443,7 @@ def translate(q: str, source: str, target: str) -> str:
                 with _TRANSLATE_SEM:
                     response = sess.get(url, params=params, timeout=10)
         response.raise_for_status()
-        result = response.json()
+        result = orjson.loads(response.content)
         if result and len(result) > 0 and len(result[0]) > 0:
             translated_text = "".join([part[0] for part in result[0] if part and part[0]])
             return translated_text
@@ -280,6 +468,109 @@ def translate(q: str, source: str, target: str) -> str:
             return q  # Return original text if all translation methods fail
 
 
+def translate_many(texts: List[str], source: str, target: str) -> List[str]:
+    """
+    Translate several segments with a single request to the local service
+    (LibreTranslate accepts a list for "q"). Segments it does not translate go
+    through the Google fallbacks concurrently, bounded by TRANSLATE_CONCURRENCY.
+    """
+    results = list(texts)
+    pending = []
+    for i, q in enumerate(texts):
+        if not q or not str(q).strip():
+            continue
+        cached = _read_translation(_translation_key(q, source, target))
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+    misses = list(pending)
+
+    local_url = os.environ.get("LOCAL_TRANSLATE_URL", "http://127.0.0.1:5000/translate")
+    data = {"q": [texts[i] for i in pending], "source": source, "target": target, "format": "text"}
+    try:
+        with _TRANSLATE_SEM:
+            sess = _get_translate_session()
+            response = sess.post(local_url, json=data, timeout=10 + len(pending))
+        if response.status_code in (429, 503):
+            delay = _respect_retry_after(response)
+            if delay > 0:
+                time.sleep(delay + 0.1)
+                with _TRANSLATE_SEM:
+                    response = sess.post(local_url, json=data, timeout=10 + len(pending))
+        response.raise_for_status()
+        js = orjson.loads(response.content)
+        translated = js.get("translatedText") if isinstance(js, dict) else None
+        if not isinstance(translated, list) or len(translated) != len(pending):
+            raise ValueError("Unexpected batch response shape from local translator")
+        failed = []
+        for i, text in zip(pending, translated):
+            if text:
+                results[i] = text
+            else:
+                failed.append(i)
+        pending = failed
+    except Exception as e:
+        logger.warning(f"Local batch translation failed ({e}). Fallback to Google endpoint...")
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=TRANSLATE_CONCURRENCY) as pool:
+            fallbacks = pool.map(lambda i: _translate_fallback(texts[i], source, target), pending)
+            for i, text in zip(pending, fallbacks):
+                results[i] = text
+
+    for i in misses:
+        if results[i] and results[i] != texts[i]:
+            _write_translation(_translation_key(texts[i], source, target), results[i])
+    return results
+
+
+# ---- Sentence splitting for MarianMT ----------------------------------
+# Punkt only breaks after . ! ? (plus closing quotes/brackets) followed by whitespace
+_SENTENCE_BREAK = re.compile(r"[.!?][\"')\]]*\s")
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Punkt sentence split; titles and other text without a possible break skip it entirely."""
+    if not _SENTENCE_BREAK.search(text):
+        text = text.strip()
+        return [text] if text else []
+    from utils import get_punkt  # local: utils imports config, which imports the crawlers and this module
+    return get_punkt().tokenize(text)
+
+
+# ---- MarianMT models, loaded once per source language -----------------
+_MT_MODELS: Dict[str, tuple] = {}
+_MT_LOCK = threading.Lock()
+MT_BATCH_SIZE = 16
+MT_MAX_TOKENS = 512
+
+
+def _get_mt(source: str) -> tuple:
+    """Return the cached (tokenizer, model) for source -> en, loading it on first use."""
+    mt = _MT_MODELS.get(source)
+    if mt is None:
+        with _MT_LOCK:
+            mt = _MT_MODELS.get(source)
+            if mt is None:
+                import torch
+
+                use_cuda = torch.cuda.is_available()
+                model_name = f"Helsinki-NLP/opus-mt-{source}-en"
+                tokenizer = MarianTokenizer.from_pretrained(model_name)
+                # Half precision on GPU; CPU stays fp32 where fp16 kernels are slow
+                model = MarianMTModel.from_pretrained(
+                    model_name, torch_dtype=torch.float16 if use_cuda else torch.float32
+                )
+                if use_cuda:
+                    model = model.to("cuda")
+                model.eval()
+                mt = _MT_MODELS[source] = (tokenizer, model)
+    return mt
+
+
 def translateMT(text: str, source: str) -> str:
     """
     MarianMT translation with fallback to Google Translate -> googletrans.
@@ -294,35 +585,25 @@ def translateMT(text: str, source: str) -> str:
         return translate(text, source=source, target="en")
 
     try:
-        model_name = f"Helsinki-NLP/opus-mt-{source}-en"
-        tokenizer = MarianTokenizer.from_pretrained(model_name)
-        model = MarianMTModel.from_pretrained(model_name)
-
-        sentences = sent_tokenize(text)
+        tokenizer, model = _get_mt(source)
+
+        # Sentences longer than the model limit are split into MT_MAX_TOKENS pieces
+        sentences = _split_sentences(text)
+        pieces = [
+            ids[i : i + MT_MAX_TOKENS]
+            for ids in tokenizer(sentences, truncation=False)["input_ids"]
+            for i in range(0, len(ids), MT_MAX_TOKENS)
+        ]
         translated_sentences = []
 
-        for sentence in sentences:
-            tokens = tokenizer(sentence, return_tensors="pt", padding=True, truncation=False)
-
-            # If the sentence exceeds 512 tokens, split into chunks
-            input_ids = tokens["input_ids"][0]
-            if input_ids.size(0) > 512:
-                # split into 512-token chunks
-                chunks = [input_ids[i : i + 512] for i in range(0, input_ids.size(0), 512)]
-                for chunk in chunks:
-                    # build minimal tensors
-                    attn = (chunk != tokenizer.pad_token_id).to(dtype=torch.long)
-                    chunk_tensor = {
-                        "input_ids": chunk.unsqueeze(0),
-                        "attention_mask": attn.unsqueeze(0),
-                    }
-                    translated = model.generate(**chunk_tensor)
-                    tgt_text = tokenizer.decode(translated[0], skip_special_tokens=True)
-                    translated_sentences.append(tgt_text)
-            else:
-                translated = model.generate(**tokens)
-                tgt_text = tokenizer.decode(translated[0], skip_special_tokens=True)
-                translated_sentences.append(tgt_text)
+        # One padded generate call per batch of pieces, without autograd bookkeeping
+        with torch.inference_mode():
+            for i in range(0, len(pieces), MT_BATCH_SIZE):
+                batch = tokenizer.pad(
+                    {"input_ids": pieces[i : i + MT_BATCH_SIZE]}, return_tensors="pt"
+                ).to(model.device)
+                translated = model.generate(**batch)
+                translated_sentences.extend(tokenizer.batch_decode(translated, skip_special_tokens=True))
 
         return " ".join(translated_sentences)
 
@@ -345,7 +626,7 @@ def translateMT(text: str, source: str) -> str:
                         response = sess.get(url, params=params, timeout=10)
 
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             if result and len(result) > 0 and len(result[0]) > 0:
                 translated_text = "".join([part[0] for part in result[0] if part and part[0]])
                 logger.info(f" Google Translate fallback successful for {source}")
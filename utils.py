@@ -5,20 +5,34 @@ Contains helper functions for URL canonicalization, content hashing, date handli
 
 import hashlib
 import json
+import logging
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from typing import Any, Dict, List, Union
 
-from config import TRACKING_PREFIXES
+import numpy as np
+from dateutil.parser import parse as _dateutil_parse
+
+from config import EU_COUNTRIES, TRACKING_PREFIXES, CONTENT_HASH_ALGO
+
+logger = logging.getLogger(__name__)
 
 # ===================== URL CANONICALIZATION =====================
 
+# one anchored match per query key instead of lower() + a tuple startswith
+_TRACKING_RE = re.compile('^(?:' + '|'.join(re.escape(p) for p in TRACKING_PREFIXES) + ')', re.IGNORECASE)
+
 def canonicalize_url(u: str) -> str:
     """Canonicalize URL by removing tracking parameters, normalizing scheme/host, etc."""
     if not u or not isinstance(u, str):
         return u
-    
+    return _canonicalize_cached(u)
+
+# Index and category pages are seen over and over while scraping; str -> str, so safe to memoize
+@lru_cache(maxsize=16384)
+def _canonicalize_cached(u: str) -> str:
     try:
         s = urlsplit(u.strip())
         # lowercase scheme/host
@@ -26,10 +40,13 @@ def canonicalize_url(u: str) -> str:
         netloc = s.netloc.lower()
         path = s.path or '/'
         
-        # clean query from tracking params & sort
-        q = [(k, v) for (k, v) in parse_qsl(s.query, keep_blank_values=True)
-             if not k.lower().startswith(TRACKING_PREFIXES)]
-        query = urlencode(sorted(q))
+        # clean query from tracking params & sort (most article URLs have no query at all)
+        if not s.query:
+            query = ''
+        else:
+            q = [(k, v) for (k, v) in parse_qsl(s.query, keep_blank_values=True)
+                 if not _TRACKING_RE.match(k)]
+            query = urlencode(sorted(q) if len(q) > 1 else q)
         
         # remove anchors and normalize path
         return urlunsplit((scheme, netloc, path.rstrip('/'), query, ''))
@@ -38,57 +55,92 @@ def canonicalize_url(u: str) -> str:
 
 # ===================== CONTENT HASHING =====================
 
+try:
+    from blake3 import blake3  # optional: SIMD tree hashing for content_hash
+except ImportError:
+    blake3 = None
+
+# algorithm behind content_hash; store it as hash_algo next to the digest so a switch can be migrated
+HASH_ALGO = 'blake3' if CONTENT_HASH_ALGO == 'blake3' and blake3 is not None else 'sha256'
+
 def content_hash(title: str, body: str) -> str:
     """Generate content hash from title and body for duplicate detection."""
     try:
-        raw = (title or '').strip() + '\n' + (body or '').strip()
-        return hashlib.sha256(raw.encode('utf-8', errors='ignore')).hexdigest()
+        # feed the hasher piecewise so title + body is never concatenated in memory
+        h = blake3() if HASH_ALGO == 'blake3' else hashlib.sha256()
+        h.update((title or '').strip().encode('utf-8', errors='ignore'))
+        h.update(b'\n')
+        h.update((body or '').strip().encode('utf-8', errors='ignore'))
+        return h.hexdigest()
     except Exception:
         return ''
 
 # ===================== DATE HANDLING =====================
 
 # safe_date_conversion() function removed - replaced by normalize_article_dates_for_database()
+# make_json_serializable_with_date_logging() removed - replaced by dumps_with_dates()
+
+def _json_default(o):
+    """json.dumps default hook: datetimes become ISO strings, anything else is still an error."""
+    if isinstance(o, datetime):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
-def make_json_serializable_with_date_logging(data, context="", article_data=None):
+def dumps_with_dates(data, **kwargs) -> str:
     """
-    Convert datetime objects to strings for JSON serialization with date logging.
-    
-    Args:
-        data: The data to make JSON serializable
-        context: Context information for logging
-        article_data: Full article data to log if date conversion fails
-        
-    Returns:
-        JSON serializable data
+    Serialize data to JSON, converting datetime objects to ISO strings.
+
+    No Python-level copy of data is made: the C encoder walks the structure and
+    only calls _json_default for the datetime leaves.
+    """
+    kwargs.setdefault('ensure_ascii', False)
+    return json.dumps(data, default=_json_default, **kwargs)
+
+# Non-ISO shapes seen in feeds (RSS pubDate is RFC 2822), tried before dateutil
+_DATE_FORMATS = (
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%d %b %Y %H:%M:%S %z',
+    '%a, %d %b %Y %H:%M %z',
+)
+
+# Feeds repeat the same publication_date/lastmod strings across items; datetimes are
+# immutable, so handing out the cached instance is safe
+@lru_cache(maxsize=4096)
+def _fast_parse(value: str) -> datetime:
+    """Parse a date string: ISO 8601 via fromisoformat, known feed formats via strptime, else dateutil."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return _dateutil_parse(value)
+
+# Date fields that should be converted to datetime objects
+_DATE_FIELDS = ('publication_date', 'lastmod', 'created_at', 'updated_at', 'imported_at')
+
+def normalize_article_dates_for_database(article, parsed=None):
+    """
+    Return article with its string date fields parsed to datetimes.
+
+    The dict is copied only when a field is rewritten or imported_at is added;
+    otherwise the input itself is returned. parsed optionally maps date strings to
+    datetimes already parsed in bulk (see normalize_batch); strings missing from it
+    are parsed one at a time.
     """
-    if isinstance(data, dict):
-        serializable_data = {}
-        for key, value in data.items():
-            if isinstance(value, datetime):
-                serializable_data[key] = value.isoformat()
-            elif isinstance(value, dict):
-                serializable_data[key] = make_json_serializable_with_date_logging(value, f"{context}.{key}", article_data)
-            elif isinstance(value, list):
-                serializable_data[key] = [make_json_serializable_with_date_logging(item, f"{context}.{key}[{i}]", article_data) if isinstance(item, dict) else item for i, item in enumerate(value)]
-            else:
-                # Date normalization is handled centrally by normalize_article_dates_for_database()
-                serializable_data[key] = value
-        return serializable_data
-    return data
-
-def normalize_article_dates_for_database(article):
     if not isinstance(article, dict):
         return article
     
-    normalized_article = article.copy()
+    # copy-on-write: most stored articles already carry datetimes
+    if 'imported_at' in article and not any(isinstance(article.get(f), str) for f in _DATE_FIELDS):
+        return article
     
-    # List of date fields that should be converted to datetime objects
-    date_fields = [
-        'publication_date', 'lastmod', 'created_at', 'updated_at', 'imported_at'
-    ]
+    normalized_article = article.copy()
     
-    for field in date_fields:
+    for field in _DATE_FIELDS:
         if field in normalized_article and normalized_article[field] is not None:
             value = normalized_article[field]
             
@@ -99,19 +151,10 @@ def normalize_article_dates_for_database(article):
             # If it's a string, try to convert it to datetime
             if isinstance(value, str) and value.strip():
                 try:
-                    # Try different parsing methods
-                    if 'T' in value and ('Z' in value or '+' in value or '-' in value[-6:]):
-                        # ISO format
-                        normalized_article[field] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    else:
-                        # Try dateutil parser
-                        from dateutil.parser import parse
-                        normalized_article[field] = parse(value)
-                    
-                    print(f"✅ Normalized {field} to datetime: {normalized_article[field]}")
-                    
+                    normalized_article[field] = parsed[value] if parsed and value in parsed else _fast_parse(value)
+                    logger.debug("Normalized %s to datetime: %s", field, normalized_article[field])
                 except Exception as e:
-                    print(f"⚠️ Could not normalize {field} '{value}': {e}")
+                    logger.warning("Could not normalize %s '%s': %s", field, value, e)
                     # Keep original value if conversion fails
                     continue
     
@@ -120,52 +163,113 @@ def normalize_article_dates_for_database(article):
         normalized_article['imported_at'] = datetime.now(timezone.utc)
     elif isinstance(normalized_article['imported_at'], str):
         try:
-            from dateutil.parser import parse
-            normalized_article['imported_at'] = parse(normalized_article['imported_at'])
+            normalized_article['imported_at'] = _dateutil_parse(normalized_article['imported_at'])
         except:
             normalized_article['imported_at'] = datetime.now(timezone.utc)
     
     return normalized_article
 
+def normalize_batch(articles):
+    """
+    Batch form of normalize_article_dates_for_database() for a list of articles.
+
+    Every distinct date string in the batch is parsed once, vectorized through
+    pandas.to_datetime; strings pandas cannot read fall back to the per-value parser.
+    Results are UTC-aware, which is what MongoDB stores for naive datetimes anyway.
+    """
+    strings = {
+        value
+        for article in articles if isinstance(article, dict)
+        for field in _DATE_FIELDS
+        if isinstance(value := article.get(field), str) and value.strip()
+    }
+    parsed = {}
+    if strings:
+        import pandas as pd
+
+        values = list(strings)
+        try:
+            # format='mixed' (pandas >= 2.0) infers the format per element
+            stamps = pd.to_datetime(values, errors='coerce', utc=True, format='mixed')
+        except (TypeError, ValueError):
+            stamps = ()
+        for value, stamp in zip(values, stamps):
+            if not pd.isna(stamp):
+                parsed[value] = stamp.to_pydatetime()
+    return [normalize_article_dates_for_database(article, parsed) for article in articles]
+
 # ===================== DATA SANITIZATION =====================
 
-def sanitize_for_mongo(obj):
-    """Sanitize data for MongoDB storage by converting numpy types to Python types."""
-    import numpy as np
-    
+# numpy's abstract bases already cover float32/float64, int32/int64, etc.
+_NP_FLOAT = (np.floating,)
+_NP_INT = (np.integer,)
+_NP_TYPES = (np.generic, np.ndarray)
+
+def _needs_sanitize(obj) -> bool:
+    """Return True if any numpy value is nested anywhere inside obj."""
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(cur)
+        elif isinstance(cur, _NP_TYPES):
+            return True
+    return False
+
+def _sanitize_copy(obj):
+    """Copy obj, converting numpy types to Python types."""
     if isinstance(obj, dict):
-        return {k: sanitize_for_mongo(v) for k, v in obj.items()}
+        return {k: _sanitize_copy(v) for k, v in obj.items()}
     elif isinstance(obj, list):
-        return [sanitize_for_mongo(i) for i in obj]
-    elif isinstance(obj, (np.floating, np.float32, np.float64)):
+        return [_sanitize_copy(i) for i in obj]
+    elif isinstance(obj, _NP_FLOAT):
         return float(obj)
-    elif isinstance(obj, (np.integer, np.int32, np.int64)):
+    elif isinstance(obj, _NP_INT):
         return int(obj)
-    elif isinstance(obj, (np.bool_,)):
+    elif isinstance(obj, np.bool_):
         return bool(obj)
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
     else:
         return obj
 
+def sanitize_for_mongo(obj):
+    """Sanitize data for MongoDB storage by converting numpy types to Python types."""
+    # most scraped articles hold no numpy values at all: hand them back without copying
+    if not _needs_sanitize(obj):
+        return obj
+    return _sanitize_copy(obj)
+
 # ===================== COUNTRY UTILITIES =====================
 
 def is_eu_country(country):
     """Check if a country is in the European Union."""
-    from config import EU_COUNTRIES
     return country in EU_COUNTRIES
 
 # ===================== TEXT PROCESSING =====================
 
+@lru_cache(maxsize=None)
+def get_punkt():
+    """
+    Load the English Punkt sentence tokenizer on first use and share it; sent_tokenize
+    would look it up on every call. Used by the summarizer, location extraction and MT.
+    """
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer  # NLTK >= 3.8.2 (punkt_tab)
+        return PunktTokenizer("english")
+    except ImportError:
+        import nltk
+        return nltk.data.load("tokenizers/punkt/english.pickle")
+
 def _make_fallback_summary(text: str) -> str:
     """Simple, robust fallback summarizer when no model is available."""
-    from nltk.tokenize import sent_tokenize
-    
     text = (text or "").strip()
     if not text:
         return ""
     # 1st and 2nd sentence or first ~200-300 chars
-    sents = sent_tokenize(text)
+    sents = get_punkt().tokenize(text)
     if sents:
         return " ".join(sents[:2])[:300]
     return text[:300]
@@ -173,125 +277,161 @@ def _make_fallback_summary(text: str) -> str:
 # ===================== PARTICIPANT COUNT EXTRACTION =====================
 import re
 
+try:
+    import re2  # optional: linear-time matching for the participant patterns
+except ImportError:
+    re2 = None
+
+# Crowd labels; every participant-count pattern ends in one of these
+PARTICIPANT_LABELS = r"(?:people|attendees|participants|protesters|supporters|workers|activists|citizens|demonstrators|strikers|employees|crowd|union members|marchers)"
+
+# Cheap cue: text without any label cannot yield a participant count
+PARTICIPANT_CUE_PATTERN = rf"{PARTICIPANT_LABELS}\b"
+
+# Result when no participant count is found
+NO_PARTICIPANT_COUNTS = {"total_estimated": 0, "max_count": 0, "min_count": 0}
+
+# Words → numbers (approximate)
+# Bare number words, looked up directly; the few multi-word phrases are kept apart so
+# single-word inputs never hash a long phrase key
+_NUMBER_WORDS_SINGLE = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "couple": 2, "few": 3, "several": 5, "dozen": 12, "dozens": 24,  
+    "scores": 40,  
+    "hundred": 100, "hundreds": 200,  
+    "thousand": 1_000, "thousands": 2000,
+    "million": 1_000_000, "millions": 2_000_000,
+    "billion": 1_000_000_000, "billions": 2_000_000_000,
+    "handful": 5,
+}
+_NUMBER_WORDS_MULTI = {
+    "tens of thousands": 10_000,
+    "hundreds of thousands": 100_000,
+    "half a million": 500_000,
+    "quarter of a million": 250_000,
+}
+
+# Numeric token (with separators/decimals) + optional K/M/B suffix
+_NUM_TOKEN = r"(?P<num>\d{1,3}(?:[,\s]\d{3})*|\d+(?:\.\d+)?)\s*(?P<sfx>[KkMmBb])?"
+_NUM_TOKEN2 = r"(?P<num2>\d{1,3}(?:[,\s]\d{3})*|\d+(?:\.\d+)?)\s*(?P<sfx2>[KkMmBb])?"
+
+# “<num> million/billion/thousand”
+_NUMBER_UNIT_PHRASE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s+(million|billion|thousand)s?\s*$")
+
+# Contrast markers that turn two numbers into a min/max pair (space-delimited, as matched on the lowered span)
+_CONFLICT_RE = re.compile(r" (?:while|whereas|but|however|on the other hand|in contrast|by contrast) ")
+
+# Patterns (all with named groups), compiled once at import. Each is paired with
+# literal guards checked against the lowercased text: a pattern only runs when
+# every guard group has a hit, since it cannot match otherwise.
+_DIGITS = tuple("0123456789")
+
+def _compile_participant(pattern: str, dotall: bool = False):
+    """
+    Compile with RE2 when installed (no backtracking on the .*? spans), else with re.
+    Flags are inline because RE2 takes them in the pattern rather than as arguments.
+    """
+    pattern = ("(?is)" if dotall else "(?i)") + pattern
+    return re2.compile(pattern) if re2 is not None else re.compile(pattern)
+
+_PARTICIPANT_PATTERNS = [
+    # between A and B people
+    ((("between",), _DIGITS), _compile_participant(rf"\bbetween\s+{_NUM_TOKEN}\s+and\s+{_NUM_TOKEN2}\s+{PARTICIPANT_LABELS}\b")),
+
+    # conflicting estimates: ... A ... (while|but|however) ... B ...
+    ((_DIGITS, ("while", "whereas", "but", "however", "meanwhile", "other", "contrast")), _compile_participant(
+        rf"\b{_NUM_TOKEN}\s+{PARTICIPANT_LABELS}.*?\b(?:while|whereas|but|however|meanwhile|on\s+the\s+other\s+hand|in\s+contrast|by\s+contrast)\b.*?{_NUM_TOKEN2}\s+{PARTICIPANT_LABELS}\b",
+        dotall=True
+    )),
+
+    # single numeric with qualifiers
+    ((_DIGITS,), _compile_participant(
+        rf"\b(?:more than|over|at least|around|approximately|some|estimated|nearly|about|up to|as many as)?\s*{_NUM_TOKEN}\s+{PARTICIPANT_LABELS}\b"
+    )),
+
+    # estimated number
+    ((("estimated",), _DIGITS), _compile_participant(rf"\b(?:an\s+)?estimated\s+(?:number of\s+)?{_NUM_TOKEN}\s+{PARTICIPANT_LABELS}\b")),
+
+    # word numbers (one|dozens|hundreds|…)
+    ((), _compile_participant(
+        r"\b(?P<word>"
+        r"one|two|three|four|five|six|seven|eight|nine|ten|"
+        r"several|few|couple|dozen|dozens|scores|"
+        r"hundred|hundreds|thousand|thousands|"
+        r"tens of thousands|hundreds of thousands|"
+        r"million|millions|billion|billions|"
+        r"half a million|quarter of a million"
+        r")\b\s+" + PARTICIPANT_LABELS
+    )),
+
+    # handful of X
+    ((("handful",),), _compile_participant(rf"\b(?:a|only a)?\s*handful\s+of\s+{PARTICIPANT_LABELS}\b")),
+
+    # 1k / 2.5K style
+    ((_DIGITS,), _compile_participant(rf"\b{_NUM_TOKEN}\s*{PARTICIPANT_LABELS}\b")),
+]
+
+# Helper: parse number string + suffixes + phrases like “1 million”
+def _parse_num_str(val: str, sfx: str | None) -> float:
+    v = val.replace(",", "").replace(" ", "")
+    try:
+        x = float(v)
+    except ValueError:
+        return 0.0
+    if sfx:
+        sfx = sfx.lower()
+        if sfx == "k": x *= 1_000
+        elif sfx == "m": x *= 1_000_000
+        elif sfx == "b": x *= 1_000_000_000
+    return x
+
+def _parse_number_phrase(phrase: str) -> int:
+    p = phrase.lower().strip()
+    # letters only: no whitespace and no digits, so neither a phrase nor "<num> <unit>" can match
+    if p.isalpha():
+        return _NUMBER_WORDS_SINGLE.get(p, 0)
+    if p in _NUMBER_WORDS_MULTI:
+        return _NUMBER_WORDS_MULTI[p]
+    m = _NUMBER_UNIT_PHRASE.match(p)
+    if m:
+        base = float(m.group(1))
+        unit = m.group(2)
+        mul = 1_000_000 if unit == "million" else 1_000_000_000 if unit == "billion" else 1_000
+        return int(base * mul)
+    # “half a million” / “quarter of a million”
+    if "half a million" in p: return 500_000
+    if "quarter of a million" in p: return 250_000
+    return 0
+
 def extract_participant_count(text: str) -> dict:
     """Extract participant counts from text using robust regex + number parsing."""
     if not text:
         return {"counts": [], "total_estimated": 0, "max_count": 0}
 
-    # Words → numbers (approximate)
-    number_words = {
-        "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-        "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
-        "couple": 2, "few": 3, "several": 5, "dozen": 12, "dozens": 24,  
-        "scores": 40,  
-        "hundred": 100, "hundreds": 200,  
-        "thousand": 1_000, "thousands": 2000,
-        "tens of thousands": 10_000,
-        "hundreds of thousands": 100_000,
-        "million": 1_000_000, "millions": 2_000_000,
-        "billion": 1_000_000_000, "billions": 2_000_000_000,
-        "handful": 5,
-        "half a million": 500_000,
-        "quarter of a million": 250_000,
-    }
-
-    # Common labels
-    labels = r"(?:people|attendees|participants|protesters|supporters|workers|activists|citizens|demonstrators|strikers|employees|crowd|union members|marchers)"
-
-    # Numeric token (with separators/decimals) + optional K/M/B suffix
-    NUM_TOKEN = r"(?P<num>\d{1,3}(?:[,\s]\d{3})*|\d+(?:\.\d+)?)\s*(?P<sfx>[KkMmBb])?"
-    NUM_TOKEN2 = r"(?P<num2>\d{1,3}(?:[,\s]\d{3})*|\d+(?:\.\d+)?)\s*(?P<sfx2>[KkMmBb])?"
-
-    # Helper: parse number string + suffixes + phrases like “1 million”
-    def parse_num_str(val: str, sfx: str | None) -> float:
-        v = val.replace(",", "").replace(" ", "")
-        try:
-            x = float(v)
-        except ValueError:
-            return 0.0
-        if sfx:
-            sfx = sfx.lower()
-            if sfx == "k": x *= 1_000
-            elif sfx == "m": x *= 1_000_000
-            elif sfx == "b": x *= 1_000_000_000
-        return x
-
-    def parse_number_phrase(phrase: str) -> int:
-        p = phrase.lower().strip()
-        if p in number_words:
-            return int(number_words[p])
-        # “<num> million/billion/thousand”
-        m = re.match(rf"^\s*(\d+(?:\.\d+)?)\s+(million|billion|thousand)s?\s*$", p)
-        if m:
-            base = float(m.group(1))
-            unit = m.group(2)
-            mul = 1_000_000 if unit == "million" else 1_000_000_000 if unit == "billion" else 1_000
-            return int(base * mul)
-        # “half a million” / “quarter of a million”
-        if "half a million" in p: return 500_000
-        if "quarter of a million" in p: return 250_000
-        return 0
-
-    # Patterns (all with named groups)
-    patterns = [
-        # between A and B people
-        re.compile(rf"\bbetween\s+{NUM_TOKEN}\s+and\s+{NUM_TOKEN2}\s+{labels}\b", re.IGNORECASE),
-
-        # conflicting estimates: ... A ... (while|but|however) ... B ...
-        re.compile(
-            rf"\b{NUM_TOKEN}\s+{labels}.*?\b(?:while|whereas|but|however|meanwhile|on\s+the\s+other\s+hand|in\s+contrast|by\s+contrast)\b.*?{NUM_TOKEN2}\s+{labels}\b",
-            re.IGNORECASE | re.DOTALL
-        ),
-
-        # single numeric with qualifiers
-        re.compile(
-            rf"\b(?:more than|over|at least|around|approximately|some|estimated|nearly|about|up to|as many as)?\s*{NUM_TOKEN}\s+{labels}\b",
-            re.IGNORECASE
-        ),
-
-        # estimated number
-        re.compile(rf"\b(?:an\s+)?estimated\s+(?:number of\s+)?{NUM_TOKEN}\s+{labels}\b", re.IGNORECASE),
-
-        # word numbers (one|dozens|hundreds|…)
-        re.compile(
-            r"\b(?P<word>"
-            r"one|two|three|four|five|six|seven|eight|nine|ten|"
-            r"several|few|couple|dozen|dozens|scores|"
-            r"hundred|hundreds|thousand|thousands|"
-            r"tens of thousands|hundreds of thousands|"
-            r"million|millions|billion|billions|"
-            r"half a million|quarter of a million"
-            r")\b\s+" + labels,
-            re.IGNORECASE
-        ),
-
-        # handful of X
-        re.compile(rf"\b(?:a|only a)?\s*handful\s+of\s+{labels}\b", re.IGNORECASE),
-
-        # 1k / 2.5K style
-        re.compile(rf"\b{NUM_TOKEN}\s*{labels}\b", re.IGNORECASE),
-    ]
-
     # Iterate and collect matches (avoid duplicate spans)
     seen_spans = set()
     total_estimated = 0
     max_count = 0
     min_count = float('inf')  # Initialize with infinity
 
-    for pat in patterns:
+    lowered = text.lower()
+    for guards, pat in _PARTICIPANT_PATTERNS:
+        if not all(any(lit in lowered for lit in group) for group in guards):
+            continue
         for m in pat.finditer(text):
             span = m.span()
             if span in seen_spans:
                 continue
             seen_spans.add(span)
 
-            ctx = m.group(0)
+            ctx_lower = m.group(0).lower()
             raw = 0.0
 
             # Case 1: between A and B
-            if "between" in ctx.lower() and (" and " in ctx.lower()):
-                n1 = parse_num_str(m.group("num") or "0", m.group("sfx"))
-                n2 = parse_num_str(m.group("num2") or "0", m.group("sfx2"))
+            if "between" in ctx_lower and " and " in ctx_lower:
+                n1 = _parse_num_str(m.group("num") or "0", m.group("sfx"))
+                n2 = _parse_num_str(m.group("num2") or "0", m.group("sfx2"))
                 lo, hi = sorted([n1, n2])
                 if hi > 0:
                     total_estimated += hi
@@ -300,9 +440,9 @@ def extract_participant_count(text: str) -> dict:
                 continue
                 
             # Case 2: conflicting estimates A ... (while|but) ... B => keep both as min/max
-            if any(w in ctx.lower() for w in [" while ", " whereas ", " but ", " however ", " on the other hand ", " in contrast ", " by contrast "]):
-                n1 = parse_num_str(m.group("num") or "0", m.group("sfx"))
-                n2 = parse_num_str(m.group("num2") or "0", m.group("sfx2"))
+            if _CONFLICT_RE.search(ctx_lower):
+                n1 = _parse_num_str(m.group("num") or "0", m.group("sfx"))
+                n2 = _parse_num_str(m.group("num2") or "0", m.group("sfx2"))
                 min_val, max_val = sorted([n1, n2])
                 
                 if max_val > 0:
@@ -313,17 +453,17 @@ def extract_participant_count(text: str) -> dict:
 
             # Case 3: word-based number
             elif "word" in m.groupdict() and m.group("word"):
-                raw = float(parse_number_phrase(m.group("word")))
+                raw = float(_parse_number_phrase(m.group("word")))
 
             # Case 4: single numeric token (with suffix)
             elif "num" in m.groupdict():
-                raw = parse_num_str(m.group("num") or "0", m.group("sfx"))
-
-            # Fallback
-            if raw <= 0:
-            continue
+                raw = _parse_num_str(m.group("num") or "0", m.group("sfx"))
 
+            # Fallback: nothing usable parsed (also drops sub-0.5 values that round to 0)
             count_int = int(round(raw))
+            if count_int <= 0:
+                continue
+
             total_estimated += count_int
             max_count = max(max_count, count_int)
             min_count = min(min_count, count_int)